@@ -12,7 +12,9 @@ import sys
 import subprocess
 import json
 import shutil
+import ast
 from datetime import datetime
+from functools import lru_cache, partial
 from typing import Dict, List, Any, Optional
 import configparser
 
@@ -244,13 +246,24 @@ def friendly_name(s):
 
 def clean_value(value):
     """Clean a value, converting nan to empty string."""
-    if pd.isna(value):
+    if value is None:
         return ''
-    s = str(value)
+    # NaN is the only missing marker a DataFrame cell gives us here; skip pd.isna
+    if isinstance(value, float) and value != value:
+        return ''
+    s = value if isinstance(value, str) else str(value)
     if s.lower() == 'nan':
         return ''
     return s
 
+@lru_cache(maxsize=4096)
+def _safe_literal_eval(s):
+    """Parse a Python literal, returning (ok, value). Results are cached, so do not mutate value."""
+    try:
+        return True, ast.literal_eval(s)
+    except Exception:
+        return False, None
+
 def make_relative_path(filepath, base_dir=None):
     """Convert absolute path to relative, always using forward slashes."""
     if not filepath:
@@ -557,10 +570,21 @@ TEST_TYPE_DEFINITIONS = {
     },
 }
 
+def input_record(value):
+    """Build an editable {'value', 'is_numpy'} record from a saved test input."""
+    if type(value) is str:
+        if value.startswith('np.array('):
+            return {'value': value[9:-1], 'is_numpy': True}
+        return {'value': value, 'is_numpy': False}
+    return {'value': str(value), 'is_numpy': False}
+
 DISPLAY_TO_INTERNAL = {v['display_name']: k for k, v in TEST_TYPE_DEFINITIONS.items()}
+DISPLAY_TO_DEFN = {v['display_name']: (k, v) for k, v in TEST_TYPE_DEFINITIONS.items()}
+DISPLAY_NAMES_SORTED = tuple(sorted(DISPLAY_TO_DEFN))
+HELP_TEXTS = {k: f"{v.get('help', '')}\n\nExample:\n{v.get('example', '')}" for k, v in TEST_TYPE_DEFINITIONS.items()}
 
 def get_display_names_sorted():
-    return sorted([v['display_name'] for v in TEST_TYPE_DEFINITIONS.values()])
+    return DISPLAY_NAMES_SORTED
 
 
 class TestInputsDialog(tk.Toplevel):
@@ -590,21 +614,10 @@ class TestInputsDialog(tk.Toplevel):
             self.input_sets = [{'args': [{'value': '', 'is_numpy': False}], 'kwargs': {}}]
             return
         try:
-            import ast
             inputs_list = ast.literal_eval(s)
             for inp in inputs_list:
-                args_list = []
-                for arg in inp.get('args', []):
-                    is_numpy = isinstance(arg, str) and arg.startswith('np.array(')
-                    if is_numpy:
-                        arg = arg[9:-1]
-                    args_list.append({'value': str(arg), 'is_numpy': is_numpy})
-                kwargs_dict = {}
-                for k, v in inp.get('kwargs', {}).items():
-                    is_numpy = isinstance(v, str) and v.startswith('np.array(')
-                    if is_numpy:
-                        v = v[9:-1]
-                    kwargs_dict[k] = {'value': str(v), 'is_numpy': is_numpy}
+                args_list = [input_record(arg) for arg in inp.get('args', [])]
+                kwargs_dict = {k: input_record(v) for k, v in inp.get('kwargs', {}).items()}
                 if not args_list:
                     args_list = [{'value': '', 'is_numpy': False}]
                 self.input_sets.append({'args': args_list, 'kwargs': kwargs_dict})
@@ -645,141 +658,171 @@ class TestInputsDialog(tk.Toplevel):
     def refresh_display(self):
         for w in self.inputs_frame.winfo_children():
             w.destroy()
-        for i, inp_set in enumerate(self.input_sets):
-            self.create_input_set_widget(i, inp_set)
-
-    def create_input_set_widget(self, idx, inp_set):
-        frame = ttk.LabelFrame(self.inputs_frame, text=f"Input Set {idx+1}", padding="5")
+        self._set_frames = []
+        self._set_vars = []
+        for inp_set in self.input_sets:
+            self._add_set_widget(inp_set)
+
+    def _sync_vars_to_model(self):
+        # Entries are read back here instead of through a trace on every keystroke
+        for bound in self._set_vars:
+            for entry, var, np_var in bound:
+                entry['value'] = var.get()
+                entry['is_numpy'] = np_var.get()
+
+    def _set_index(self, inp_set):
+        # Match by identity; two untouched input sets compare equal as dicts
+        for i, candidate in enumerate(self.input_sets):
+            if candidate is inp_set:
+                return i
+        return None
+
+    def _add_set_widget(self, inp_set):
+        frame = ttk.LabelFrame(self.inputs_frame, text=f"Input Set {len(self._set_frames)+1}", padding="5")
         frame.pack(fill=tk.X, pady=5, padx=5)
+        self._set_frames.append(frame)
+        self._set_vars.append(self.create_input_set_widget(frame, inp_set))
+
+    def _rebuild_set_widget(self, idx):
+        frame = self._set_frames[idx]
+        for w in frame.winfo_children():
+            w.destroy()
+        self._set_vars[idx] = self.create_input_set_widget(frame, self.input_sets[idx])
+
+    def create_input_set_widget(self, frame, inp_set):
+        bound = []
         if len(self.input_sets) > 1:
-            ttk.Button(frame, text="Remove Set", command=lambda: self.remove_input_set(idx)).pack(anchor=tk.E)
+            ttk.Button(frame, text="Remove Set", command=partial(self.remove_input_set, inp_set)).pack(anchor=tk.E)
         
         args_f = ttk.LabelFrame(frame, text="Arguments", padding="5")
         args_f.pack(fill=tk.X, pady=5)
         for j, arg in enumerate(inp_set['args']):
-            self.create_arg_widget(args_f, idx, j, arg)
-        ttk.Button(args_f, text="+ Add Argument", command=lambda i=idx: self.add_argument(i)).pack(pady=5)
+            bound.append(self.create_arg_widget(args_f, inp_set, j, arg))
+        ttk.Button(args_f, text="+ Add Argument", command=partial(self.add_argument, inp_set)).grid(
+            row=len(inp_set['args']), column=0, columnspan=4, pady=5)
         
         if self.has_kwargs:
             kw_f = ttk.LabelFrame(frame, text="Keyword Arguments", padding="5")
             kw_f.pack(fill=tk.X, pady=5)
-            for name, kwarg in inp_set['kwargs'].items():
-                self.create_kwarg_widget(kw_f, idx, name, kwarg)
+            for k, (name, kwarg) in enumerate(inp_set['kwargs'].items()):
+                bound.append(self.create_kwarg_widget(kw_f, inp_set, k, name, kwarg))
             add_f = ttk.Frame(kw_f)
-            add_f.pack(fill=tk.X, pady=5)
+            add_f.grid(row=len(inp_set['kwargs']), column=0, columnspan=4, sticky=tk.W, pady=5)
             kw_var = tk.StringVar()
             ttk.Label(add_f, text="Name:").pack(side=tk.LEFT)
             ttk.Entry(add_f, textvariable=kw_var, width=15).pack(side=tk.LEFT, padx=5)
-            ttk.Button(add_f, text="+ Add Kwarg", command=lambda i=idx, v=kw_var: self.add_kwarg(i, v)).pack(side=tk.LEFT)
+            ttk.Button(add_f, text="+ Add Kwarg", command=partial(self.add_kwarg, inp_set, kw_var)).pack(side=tk.LEFT)
+        return bound
 
-    def create_arg_widget(self, parent, si, ai, arg):
-        f = ttk.Frame(parent)
-        f.pack(fill=tk.X, pady=2)
-        ttk.Label(f, text=f"Arg {ai+1}:", width=8).pack(side=tk.LEFT)
+    def create_arg_widget(self, parent, inp_set, ai, arg):
+        # Rows are gridded straight into the Arguments frame; no wrapper frame per row
+        ttk.Label(parent, text=f"Arg {ai+1}:", width=8).grid(row=ai, column=0, sticky=tk.W, pady=2)
         var = tk.StringVar(value=arg['value'])
-        ttk.Entry(f, textvariable=var, width=40).pack(side=tk.LEFT, padx=5)
-        var.trace_add('write', lambda *a, s=si, i=ai, v=var: self.update_arg_value(s, i, v.get()))
+        ttk.Entry(parent, textvariable=var, width=40).grid(row=ai, column=1, padx=5, pady=2)
         np_var = tk.BooleanVar(value=arg['is_numpy'])
-        ttk.Checkbutton(f, text="numpy array", variable=np_var, 
-                       command=lambda s=si, i=ai, v=np_var: self.update_arg_numpy(s, i, v.get())).pack(side=tk.LEFT, padx=5)
-        if len(self.input_sets[si]['args']) > 1:
-            ttk.Button(f, text="X", width=3, command=lambda s=si, i=ai: self.remove_argument(s, i)).pack(side=tk.LEFT)
-
-    def create_kwarg_widget(self, parent, si, name, kwarg):
-        f = ttk.Frame(parent)
-        f.pack(fill=tk.X, pady=2)
-        ttk.Label(f, text=f"{name}=", width=12).pack(side=tk.LEFT)
+        ttk.Checkbutton(parent, text="numpy array", variable=np_var).grid(row=ai, column=2, padx=5, pady=2)
+        if len(inp_set['args']) > 1:
+            ttk.Button(parent, text="X", width=3, command=partial(self.remove_argument, inp_set, arg)).grid(
+                row=ai, column=3, pady=2)
+        return arg, var, np_var
+
+    def create_kwarg_widget(self, parent, inp_set, ki, name, kwarg):
+        ttk.Label(parent, text=f"{name}=", width=12).grid(row=ki, column=0, sticky=tk.W, pady=2)
         var = tk.StringVar(value=kwarg['value'])
-        ttk.Entry(f, textvariable=var, width=35).pack(side=tk.LEFT, padx=5)
-        var.trace_add('write', lambda *a, s=si, n=name, v=var: self.update_kwarg_value(s, n, v.get()))
+        ttk.Entry(parent, textvariable=var, width=35).grid(row=ki, column=1, padx=5, pady=2)
         np_var = tk.BooleanVar(value=kwarg['is_numpy'])
-        ttk.Checkbutton(f, text="numpy array", variable=np_var,
-                       command=lambda s=si, n=name, v=np_var: self.update_kwarg_numpy(s, n, v.get())).pack(side=tk.LEFT, padx=5)
-        ttk.Button(f, text="X", width=3, command=lambda s=si, n=name: self.remove_kwarg(s, n)).pack(side=tk.LEFT)
+        ttk.Checkbutton(parent, text="numpy array", variable=np_var).grid(row=ki, column=2, padx=5, pady=2)
+        ttk.Button(parent, text="X", width=3, command=partial(self.remove_kwarg, inp_set, name)).grid(
+            row=ki, column=3, pady=2)
+        return kwarg, var, np_var
 
     def add_input_set(self):
-        self.input_sets.append({'args': [{'value': '', 'is_numpy': False}], 'kwargs': {}})
-        self.refresh_display()
-
-    def remove_input_set(self, idx):
-        if len(self.input_sets) > 1:
-            del self.input_sets[idx]
-            self.refresh_display()
-
-    def add_argument(self, si):
-        self.input_sets[si]['args'].append({'value': '', 'is_numpy': False})
-        self.refresh_display()
-
-    def remove_argument(self, si, ai):
-        if len(self.input_sets[si]['args']) > 1:
-            del self.input_sets[si]['args'][ai]
-            self.refresh_display()
-
-    def add_kwarg(self, si, name_var):
+        self._sync_vars_to_model()
+        inp_set = {'args': [{'value': '', 'is_numpy': False}], 'kwargs': {}}
+        self.input_sets.append(inp_set)
+        self._add_set_widget(inp_set)
+        if len(self.input_sets) == 2:
+            # The first set only gains its "Remove Set" button once a second set exists
+            self._rebuild_set_widget(0)
+
+    def remove_input_set(self, inp_set):
+        idx = self._set_index(inp_set)
+        if idx is None or len(self.input_sets) <= 1:
+            return
+        self._sync_vars_to_model()
+        del self.input_sets[idx]
+        del self._set_vars[idx]
+        self._set_frames.pop(idx).destroy()
+        for i in range(idx, len(self._set_frames)):
+            self._set_frames[i].configure(text=f"Input Set {i+1}")
+        if len(self.input_sets) == 1:
+            self._rebuild_set_widget(0)
+
+    def add_argument(self, inp_set):
+        self._sync_vars_to_model()
+        inp_set['args'].append({'value': '', 'is_numpy': False})
+        self._rebuild_set_widget(self._set_index(inp_set))
+
+    def remove_argument(self, inp_set, arg):
+        if len(inp_set['args']) > 1:
+            self._sync_vars_to_model()
+            inp_set['args'] = [a for a in inp_set['args'] if a is not arg]
+            self._rebuild_set_widget(self._set_index(inp_set))
+
+    def add_kwarg(self, inp_set, name_var):
         name = name_var.get().strip()
-        if name and name not in self.input_sets[si]['kwargs']:
-            self.input_sets[si]['kwargs'][name] = {'value': '', 'is_numpy': False}
-            self.refresh_display()
-
-    def remove_kwarg(self, si, name):
-        if name in self.input_sets[si]['kwargs']:
-            del self.input_sets[si]['kwargs'][name]
-            self.refresh_display()
-
-    def update_arg_value(self, si, ai, val):
-        if si < len(self.input_sets) and ai < len(self.input_sets[si]['args']):
-            self.input_sets[si]['args'][ai]['value'] = val
-
-    def update_arg_numpy(self, si, ai, is_np):
-        if si < len(self.input_sets) and ai < len(self.input_sets[si]['args']):
-            self.input_sets[si]['args'][ai]['is_numpy'] = is_np
-
-    def update_kwarg_value(self, si, name, val):
-        if si < len(self.input_sets) and name in self.input_sets[si]['kwargs']:
-            self.input_sets[si]['kwargs'][name]['value'] = val
-
-    def update_kwarg_numpy(self, si, name, is_np):
-        if si < len(self.input_sets) and name in self.input_sets[si]['kwargs']:
-            self.input_sets[si]['kwargs'][name]['is_numpy'] = is_np
-
-    def build_test_inputs_string(self):
+        if name and name not in inp_set['kwargs']:
+            self._sync_vars_to_model()
+            inp_set['kwargs'][name] = {'value': '', 'is_numpy': False}
+            self._rebuild_set_widget(self._set_index(inp_set))
+
+    def remove_kwarg(self, inp_set, name):
+        if name in inp_set['kwargs']:
+            self._sync_vars_to_model()
+            del inp_set['kwargs'][name]
+            self._rebuild_set_widget(self._set_index(inp_set))
+
+    def build_input_entries(self):
         result = []
         for inp_set in self.input_sets:
             args = []
             for arg in inp_set['args']:
-                val = arg['value'].strip()
-                if not val:
+                val = arg['value']
+                if not val or val.isspace():
                     continue
+                val = val.strip()
                 if arg['is_numpy']:
                     args.append(f"np.array({val})")
                 else:
-                    try:
-                        import ast
-                        args.append(ast.literal_eval(val))
-                    except:
-                        args.append(val)
+                    ok, parsed = _safe_literal_eval(val)
+                    args.append(parsed if ok else val)
             kwargs = {}
             for name, kwarg in inp_set['kwargs'].items():
-                val = kwarg['value'].strip()
-                if not val:
+                val = kwarg['value']
+                if not val or val.isspace():
                     continue
+                val = val.strip()
                 if kwarg['is_numpy']:
                     kwargs[name] = f"np.array({val})"
                 else:
-                    try:
-                        import ast
-                        kwargs[name] = ast.literal_eval(val)
-                    except:
-                        kwargs[name] = val
+                    ok, parsed = _safe_literal_eval(val)
+                    kwargs[name] = parsed if ok else val
             if args or kwargs:
                 entry = {'args': args}
                 if kwargs:
                     entry['kwargs'] = kwargs
                 result.append(entry)
+        return result
+
+    def build_test_inputs_string(self):
+        result = self.build_input_entries()
         return str(result) if result else ''
 
     def ok(self):
-        self.result = self.build_test_inputs_string()
+        self._sync_vars_to_model()
+        entries = self.build_input_entries()
+        # Hand back the count too so the editor can label it without re-parsing
+        self.result = (str(entries) if entries else '', len(entries))
         self.destroy()
 
     def cancel(self):
@@ -797,7 +840,13 @@ class TestEditorDialog(tk.Toplevel):
         self.result = None
         self.test_data = test_data or {}
         self.field_widgets = {}
+        # Parameter layouts are built once per test type and swapped in on type change
+        self._type_frames = {}
+        self._field_widgets_by_type = {}
+        self._active_type_frame = None
         self.test_inputs_str = ''
+        self._last_ti_str = None
+        self._last_ti_len = None
         self.create_widgets()
         self.load_test_data()
         self.center_window()
@@ -823,7 +872,7 @@ class TestEditorDialog(tk.Toplevel):
         
         hf = ttk.LabelFrame(main, text="Help", padding="5")
         hf.pack(fill=tk.X, pady=5)
-        self.help_text = tk.Text(hf, height=4, wrap=tk.WORD, state='disabled')
+        self.help_text = ttk.Label(hf, wraplength=740, justify=tk.LEFT, anchor='nw')
         self.help_text.pack(fill=tk.X)
         
         fc = ttk.LabelFrame(main, text="Parameters", padding="5")
@@ -860,22 +909,33 @@ class TestEditorDialog(tk.Toplevel):
         dn = self.test_type_var.get()
         if not dn:
             return
-        internal = DISPLAY_TO_INTERNAL.get(dn)
+        internal, defn = DISPLAY_TO_DEFN.get(dn, (None, {}))
         if not internal:
             return
-        defn = TEST_TYPE_DEFINITIONS.get(internal, {})
         
-        self.help_text.config(state='normal')
-        self.help_text.delete(1.0, tk.END)
-        self.help_text.insert(tk.END, f"{defn.get('help', '')}\n\nExample:\n{defn.get('example', '')}")
-        self.help_text.config(state='disabled')
+        self.help_text.config(text=HELP_TEXTS[internal])
         
-        for w in self.fields_frame.winfo_children():
-            w.destroy()
-        self.field_widgets.clear()
+        if self._active_type_frame is not None:
+            self._active_type_frame.pack_forget()
+        if internal not in self._type_frames:
+            self._build_fields_for(internal, defn)
+        self._active_type_frame = self._type_frames[internal]
+        self._active_type_frame.pack(fill=tk.BOTH, expand=True)
+        self.field_widgets = self._field_widgets_by_type[internal]
         self.ti_btn.pack_forget()
         self.ti_label.pack_forget()
         
+        if defn.get('has_test_inputs'):
+            self.ti_btn.pack(side=tk.LEFT, padx=5)
+            self.ti_label.pack(side=tk.LEFT, padx=5)
+            self.update_ti_label()
+
+    def _build_fields_for(self, internal, defn):
+        parent = ttk.Frame(self.fields_frame)
+        widgets = {}
+        self._type_frames[internal] = parent
+        self._field_widgets_by_type[internal] = widgets
+        
         row = 0
         req = defn.get('required', [])
         opt = defn.get('optional', [])
@@ -883,47 +943,42 @@ class TestEditorDialog(tk.Toplevel):
         file_f = defn.get('file_field')
         
         if req:
-            ttk.Label(self.fields_frame, text="Required Fields:", font=('TkDefaultFont', 9, 'bold')).grid(
+            ttk.Label(parent, text="Required Fields:", font=('TkDefaultFont', 9, 'bold')).grid(
                 row=row, column=0, columnspan=3, sticky=tk.W, pady=(5, 2))
             row += 1
         for f in req:
-            row = self.create_field_widget(f, row, defaults.get(f, ''), f == file_f)
+            row = self.create_field_widget(parent, widgets, f, row, defaults.get(f, ''), f == file_f)
         
         if opt:
-            ttk.Label(self.fields_frame, text="Optional Fields:", font=('TkDefaultFont', 9, 'bold')).grid(
+            ttk.Label(parent, text="Optional Fields:", font=('TkDefaultFont', 9, 'bold')).grid(
                 row=row, column=0, columnspan=3, sticky=tk.W, pady=(10, 2))
             row += 1
         for f in opt:
-            row = self.create_field_widget(f, row, defaults.get(f, ''), f == file_f)
-        
-        if defn.get('has_test_inputs'):
-            self.ti_btn.pack(side=tk.LEFT, padx=5)
-            self.ti_label.pack(side=tk.LEFT, padx=5)
-            self.update_ti_label()
+            row = self.create_field_widget(parent, widgets, f, row, defaults.get(f, ''), f == file_f)
 
-    def create_field_widget(self, field, row, default, is_file):
+    def create_field_widget(self, parent, widgets, field, row, default, is_file):
         display_label = friendly_name(field) + ":"
-        ttk.Label(self.fields_frame, text=display_label).grid(row=row, column=0, sticky=tk.W, padx=5, pady=2)
+        ttk.Label(parent, text=display_label).grid(row=row, column=0, sticky=tk.W, padx=5, pady=2)
         
         if field in BOOLEAN_FIELDS:
             var = tk.StringVar(value=default if default else '')
-            frame = ttk.Frame(self.fields_frame)
+            frame = ttk.Frame(parent)
             frame.grid(row=row, column=1, sticky=tk.W, padx=5, pady=2)
             ttk.Radiobutton(frame, text="True", variable=var, value="true").pack(side=tk.LEFT, padx=5)
             ttk.Radiobutton(frame, text="False", variable=var, value="false").pack(side=tk.LEFT, padx=5)
             ttk.Radiobutton(frame, text="(Not Used)", variable=var, value="").pack(side=tk.LEFT, padx=5)
-            self.field_widgets[field] = (var, 'boolean')
+            widgets[field] = (var, 'boolean')
         elif is_file:
             var = tk.StringVar(value=default)
-            frame = ttk.Frame(self.fields_frame)
+            frame = ttk.Frame(parent)
             frame.grid(row=row, column=1, sticky=tk.W, padx=5, pady=2)
             ttk.Entry(frame, textvariable=var, width=48).pack(side=tk.LEFT)
             ttk.Button(frame, text="Browse...", command=lambda v=var: self.browse_file(v)).pack(side=tk.LEFT, padx=5)
-            self.field_widgets[field] = (var, 'file')
+            widgets[field] = (var, 'file')
         else:
             var = tk.StringVar(value=default)
-            ttk.Entry(self.fields_frame, textvariable=var, width=55).grid(row=row, column=1, sticky=tk.W, padx=5, pady=2)
-            self.field_widgets[field] = (var, 'entry')
+            ttk.Entry(parent, textvariable=var, width=55).grid(row=row, column=1, sticky=tk.W, padx=5, pady=2)
+            widgets[field] = (var, 'entry')
         
         return row + 1
 
@@ -934,24 +989,36 @@ class TestEditorDialog(tk.Toplevel):
 
     def edit_test_inputs(self):
         dn = self.test_type_var.get()
-        internal = DISPLAY_TO_INTERNAL.get(dn, '')
-        defn = TEST_TYPE_DEFINITIONS.get(internal, {})
+        internal, defn = DISPLAY_TO_DEFN.get(dn, (None, {}))
         dialog = TestInputsDialog(self, self.test_inputs_str, defn.get('has_kwargs', False))
         self.wait_window(dialog)
         if dialog.result is not None:
-            self.test_inputs_str = dialog.result
-            self.update_ti_label()
+            self.test_inputs_str, self._last_ti_len = dialog.result
+            self._last_ti_str = self.test_inputs_str
+            self.show_ti_count()
 
     def update_ti_label(self):
+        # Only strings loaded from the test data need parsing; the inputs dialog supplies its count
+        if self.test_inputs_str == self._last_ti_str:
+            return
+        self._last_ti_str = self.test_inputs_str
+        self._last_ti_len = None
         if self.test_inputs_str:
-            try:
-                import ast
-                inp = ast.literal_eval(self.test_inputs_str)
-                self.ti_label.config(text=f"({len(inp)} input set(s) defined)")
-            except:
-                self.ti_label.config(text="(inputs defined)")
-        else:
+            ok, inp = _safe_literal_eval(self.test_inputs_str)
+            if ok:
+                try:
+                    self._last_ti_len = len(inp)
+                except TypeError:
+                    pass
+        self.show_ti_count()
+
+    def show_ti_count(self):
+        if not self.test_inputs_str:
             self.ti_label.config(text="(no inputs defined)")
+        elif self._last_ti_len is not None:
+            self.ti_label.config(text=f"({self._last_ti_len} input set(s) defined)")
+        else:
+            self.ti_label.config(text="(inputs defined)")
 
     def load_test_data(self):
         if not self.test_data:
@@ -980,12 +1047,13 @@ class TestEditorDialog(tk.Toplevel):
         if not dn:
             messagebox.showerror("Error", "Please select a test type.")
             return False
-        internal = DISPLAY_TO_INTERNAL.get(dn)
-        defn = TEST_TYPE_DEFINITIONS.get(internal, {})
-        for f in defn.get('required', []):
-            if f in self.field_widgets:
-                var, wtype = self.field_widgets[f]
-                if not var.get().strip():
+        internal, defn = DISPLAY_TO_DEFN.get(dn, (None, {}))
+        widgets = self.field_widgets
+        for f in defn.get('required', ()):
+            entry = widgets.get(f)
+            if entry is not None:
+                v = entry[0].get()
+                if not v or v.isspace():
                     messagebox.showerror("Error", f"'{friendly_name(f)}' is required.")
                     return False
         return True
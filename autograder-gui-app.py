@@ -15,6 +15,9 @@ import getpass
 from datetime import datetime
 from pathlib import Path
 import sys
+import copy
+import threading
+from functools import partial
 import numpy as np
 
 # For PDF export
@@ -52,6 +55,13 @@ except Exception as e:
     print(f"ERROR importing AutoGrader: {e}")
 
 
+def _grader_step(method_name, args, kwargs, grader, copy_args=False):
+    """Run one compiled test step: call grader.<method_name>(*args, **kwargs)"""
+    if copy_args:
+        args = copy.deepcopy(args)
+    return getattr(grader, method_name)(*args, **kwargs)
+
+
 class AutoGraderGUI:
     """GUI Application for the AutoGrader system."""
     
@@ -79,10 +89,17 @@ class AutoGraderGUI:
         
         # Data storage
         self.assignments = {}
+        self.assignment_names = []
+        self._excel = None
+        self._compiled_tests = {}
         self.config = None
         self.grader = None
         self.debug_mode = True
         self.excel_temp_file = None
+        self._script_bytes = None
+        self._script_source = None
+        self._results_log = []
+        self._saved_stdout = None
         
         # Load configuration and assignments
         print("Loading configuration...")
@@ -124,6 +141,7 @@ class AutoGraderGUI:
         if not EMBEDDED_MODE:
             print("ERROR: Cannot load assignments - embedded mode not available")
             self.assignments = {}
+            self.assignment_names = []
             return
         
         try:
@@ -131,20 +149,16 @@ class AutoGraderGUI:
             self.excel_temp_file = embedded_resources.get_excel_file()
             print(f"\u2713 Excel temp file created: {self.excel_temp_file}")
             
-            # Read all sheets from the Excel file
-            excel_file = pd.ExcelFile(self.excel_temp_file)
-            print(f"\u2713 Excel file opened, sheets: {excel_file.sheet_names}")
+            # Only read the sheet names up front; each sheet is loaded on demand
+            self._excel = pd.ExcelFile(self.excel_temp_file)
+            self.assignment_names = self._excel.sheet_names
+            print(f"\u2713 Excel file opened, sheets: {self.assignment_names}")
             
-            for sheet_name in excel_file.sheet_names:
-                df = pd.read_excel(excel_file, sheet_name=sheet_name)
-                self.assignments[sheet_name] = df.to_dict('records')
-                print(f"  \u2713 Loaded {len(df)} tests from '{sheet_name}'")
-            
-            if not self.assignments:
+            if not self.assignment_names:
                 messagebox.showwarning("No Assignments", 
                     "No assignments found in embedded Excel file")
             else:
-                print(f"\u2713 Total assignments loaded: {len(self.assignments)}")
+                print(f"\u2713 Total assignments available: {len(self.assignment_names)}")
         
         except Exception as e:
             print(f"ERROR loading assignments: {e}")
@@ -153,9 +167,24 @@ class AutoGraderGUI:
             messagebox.showerror("Load Error", 
                 f"Error loading assignments: {str(e)}")
             self.assignments = {}
+            self.assignment_names = []
+            self._excel = None
+    
+    def get_assignment_tests(self, assignment_name):
+        """Return the tests for an assignment, reading its sheet on first access"""
+        if assignment_name not in self.assignments:
+            df = pd.read_excel(self._excel, sheet_name=assignment_name)
+            self.assignments[assignment_name] = df.to_dict('records')
+            print(f"\u2713 Loaded {len(df)} tests from '{assignment_name}'")
+        return self.assignments[assignment_name]
     
     def __del__(self):
         """Cleanup temporary Excel file on exit"""
+        if getattr(self, '_excel', None) is not None:
+            try:
+                self._excel.close()
+            except:
+                pass
         if hasattr(self, 'excel_temp_file') and self.excel_temp_file:
             try:
                 embedded_resources.cleanup_temp_file(self.excel_temp_file)
@@ -193,7 +222,7 @@ class AutoGraderGUI:
         self.assignment_combo = ttk.Combobox(
             selection_frame, 
             textvariable=self.selected_assignment,
-            values=list(self.assignments.keys()),
+            values=list(self.assignment_names),
             state='readonly',
             width=40
         )
@@ -222,13 +251,11 @@ class AutoGraderGUI:
         )
         self.check_button.pack(side=tk.LEFT, padx=5)
         
-        ttk.Button(button_frame, text="Clear Results", command=self.clear_results).pack(
-            side=tk.LEFT, padx=5
-        )
+        self.clear_button = ttk.Button(button_frame, text="Clear Results", command=self.clear_results)
+        self.clear_button.pack(side=tk.LEFT, padx=5)
         
-        ttk.Button(button_frame, text="Export to PDF", command=self.export_to_pdf).pack(
-            side=tk.LEFT, padx=5
-        )
+        self.export_button = ttk.Button(button_frame, text="Export to PDF", command=self.export_to_pdf)
+        self.export_button.pack(side=tk.LEFT, padx=5)
         
         # ===== Results Section =====
         results_frame = ttk.LabelFrame(main_frame, text="Results", padding="10")
@@ -291,18 +318,28 @@ class AutoGraderGUI:
         return True
     
     def check_code(self):
-        """Run the autograder on the selected file"""
+        """Run the autograder on the selected file in a background thread"""
         if not self.validate_inputs():
             return
         
         self.status_var.set("Checking code...")
-        self.check_button.config(state='disabled')
+        # Results and the grader are only half-built until the worker finishes
+        self._set_action_buttons_state('disabled')
         self.results_text.delete(1.0, tk.END)
-        
+        self._results_log = []
+        
+        # Read the Tk variables here; the grading thread must not touch Tk directly
+        threading.Thread(
+            target=self._do_check,
+            args=(self.student_name.get(), self.selected_assignment.get(), self.selected_file.get()),
+            daemon=True
+        ).start()
+    
+    def _do_check(self, student_name, assignment_name, filepath):
+        """Grade the submission; runs on a worker thread and marshals UI updates via after()"""
         try:
             # Get assignment tests
-            assignment_name = self.selected_assignment.get()
-            tests = self.assignments[assignment_name]
+            compiled_tests = self.get_compiled_tests(assignment_name)
             
             # Check if AutoGrader is available
             try:
@@ -310,366 +347,387 @@ class AutoGraderGUI:
             except ImportError as e:
                 raise Exception(f"AutoGrader module not found: {e}.")
             
+            # Read the student's file once; the grader and email reuse it
+            with open(filepath, 'rb') as f:
+                self._script_bytes = f.read()
+            try:
+                self._script_source = self._script_bytes.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+            except UnicodeDecodeError:
+                # Let the grader read the file itself and report the error
+                self._script_source = None
+            
             # Initialize grader
-            self.grader = AutoGrader(self.selected_file.get(), timeout=15)
+            self.grader = AutoGrader(filepath, timeout=15, source=self._script_source)
             
             # Display header
-            self.display_header()
+            self.display_header(student_name, assignment_name, filepath)
             
             # Execute student script
-            self.results_text.insert(tk.END, "\n>>> Executing script...\n", 'header')
+            self._append_line("\n>>> Executing script...\n", 'header')
             success = self.grader.execute_script()
             
             if not success:
-                self.results_text.insert(tk.END, "\n\u2717 Script execution failed!\n", 'fail')
-                self.results_text.insert(tk.END, "Please check your code for errors.\n\n")
+                self._append_line("\n\u2717 Script execution failed!\n", 'fail')
+                self._append_line("Please check your code for errors.\n\n")
             else:
-                self.results_text.insert(tk.END, "\u2713 Script executed successfully!\n\n", 'pass')
+                self._append_line("\u2713 Script executed successfully!\n\n", 'pass')
             
             # Run all tests from Excel
-            self.results_text.insert(tk.END, "\n>>> Running tests...\n", 'header')
-            self.run_tests(tests)
+            self._append_line("\n>>> Running tests...\n", 'header')
+            self.run_tests(compiled_tests)
             
             # Display summary
             self.display_summary()
             
             # Send email
-            self.send_email()
+            self.send_email(student_name, assignment_name, filepath)
             
-            self.status_var.set("Code checking complete!")
+            self.root.after(0, self.status_var.set, "Code checking complete!")
             
         except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
-            self.status_var.set("Error occurred")
-            self.results_text.insert(tk.END, f"\n\nERROR: {str(e)}\n", 'fail')
+            self.root.after(0, messagebox.showerror, "Error", f"An error occurred: {str(e)}")
+            self.root.after(0, self.status_var.set, "Error occurred")
+            self._append_line(f"\n\nERROR: {str(e)}\n", 'fail')
         
         finally:
-            self.check_button.config(state='normal')
+            self.restore_grader_output()
+            self.root.after(0, self._set_action_buttons_state, 'normal')
     
-    def run_tests(self, tests):
-        """Execute tests based on Excel configuration"""
-        for test in tests:
-            test_type = test.get('test_type', '').lower()
-            
-            # Get optional custom feedback messages
-            custom_pass_feedback = self.parse_string(test.get('pass_feedback'))
-            custom_fail_feedback = self.parse_string(test.get('fail_feedback'))
-            
+    def _set_action_buttons_state(self, state):
+        """Enable or disable Check Code, Clear Results and Export to PDF together"""
+        for button in (self.check_button, self.clear_button, self.export_button):
+            button.config(state=state)
+    
+    def _append_line(self, text, tag=None):
+        """Queue text for the results panel; safe to call from the grading thread"""
+        self._results_log.append(text)
+        self.root.after(0, self._insert_result, text, tag)
+    
+    def _insert_result(self, text, tag=None):
+        """Insert text into the results panel (main thread only)"""
+        if tag:
+            self.results_text.insert(tk.END, text, tag)
+        else:
+            self.results_text.insert(tk.END, text)
+    
+    def get_compiled_tests(self, assignment_name):
+        """Return the compiled test plan for an assignment, building it on first use"""
+        if assignment_name not in self._compiled_tests:
+            tests = self.get_assignment_tests(assignment_name)
+            self._compiled_tests[assignment_name] = [self.compile_test(test) for test in tests]
+        return self._compiled_tests[assignment_name]
+    
+    def run_tests(self, compiled_tests):
+        """Execute a compiled test plan against the current grader"""
+        for step in compiled_tests:
             try:
-                if test_type == 'variable_value':
-                    self.grader.check_variable_value(
-                        test['variable_name'],
-                        self.parse_value(test['expected_value']),
-                        tolerance=float(test.get('tolerance', 1e-6)),
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'variable_type':
-                    type_map = {
-                        'int': int, 'float': float, 'str': str, 
-                        'list': list, 'dict': dict, 'tuple': tuple
-                    }
-                    expected_type = type_map.get(test['expected_value'], str)
-                    self.grader.check_variable_type(
-                        test['variable_name'], 
-                        expected_type,
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'function_exists':
-                    self.grader.check_function_exists(
-                        test['function_name'],
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'function_called':
-                    match_any_prefix = self.parse_bool(test.get('match_any_prefix', False))
-                    if match_any_prefix is None:
-                        match_any_prefix = False
-                    self.grader.check_function_called(
-                        test['function_name'],
-                        match_any_prefix=match_any_prefix,
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'function_not_called':
-                    match_any_prefix = self.parse_bool(test.get('match_any_prefix', False))
-                    if match_any_prefix is None:
-                        match_any_prefix = False
-                    self.grader.check_function_not_called(
-                        test['function_name'],
-                        match_any_prefix=match_any_prefix,
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'for_loop_used':
-                    self.grader.check_for_loop_used(
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'while_loop_used':
-                    self.grader.check_while_loop_used(
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'if_statement_used':
-                    self.grader.check_if_statement_used(
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'operator_used':
-                    self.grader.check_operator_used(
-                        test['operator'],
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'code_contains':
-                    case_sensitive = test.get('case_sensitive', True)
-                    if isinstance(case_sensitive, str):
-                        case_sensitive = case_sensitive.lower() in ['true', 'yes', '1']
-                    elif pd.isna(case_sensitive):
-                        case_sensitive = True
-                    
-                    self.grader.check_code_contains(
-                        test['phrase'],
-                        case_sensitive=bool(case_sensitive),
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'plot_created':
-                    self.grader.check_plot_created(
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'plot_properties':
-                    self.grader.check_plot_properties(
-                        title=self.parse_string(test.get('title')),
-                        xlabel=self.parse_string(test.get('xlabel')),
-                        ylabel=self.parse_string(test.get('ylabel')),
-                        has_legend=self.parse_bool(test.get('has_legend')),
-                        has_grid=self.parse_bool(test.get('has_grid')),
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'plot_data_length':
-                    self.grader.check_plot_data_length(
-                        min_length=self.parse_int(test.get('min_length')),
-                        max_length=self.parse_int(test.get('max_length')),
-                        exact_length=self.parse_int(test.get('exact_length')),
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'loop_iterations':
-                    self.grader.count_loop_iterations(
-                        test['loop_variable'],
-                        expected_count=self.parse_int(test.get('expected_count')),
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'list_equals':
-                    expected_list = self.parse_value(test.get('expected_list'))
-                    order_matters = self.parse_bool(test.get('order_matters'))
-                    if order_matters is None:
-                        order_matters = True
-                    
-                    self.grader.check_list_equals(
-                        test['variable_name'],
-                        expected_list,
-                        order_matters=order_matters,
-                        tolerance=float(test.get('tolerance', 1e-6)),
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'array_equals':
-                    expected_array = self.parse_value(test.get('expected_array'))
-                    self.grader.check_array_equals(
-                        test['variable_name'],
-                        expected_array,
-                        tolerance=float(test.get('tolerance', 1e-6)),
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'compare_solution':
-                    solution_file = test.get('solution_file')
-                    variables_to_compare = self.parse_value(test.get('variables_to_compare'))
-                    
-                    if isinstance(variables_to_compare, str):
-                        variables_to_compare = [v.strip() for v in variables_to_compare.split(',')]
-                    
-                    require_same_type = self.parse_bool(test.get('require_same_type', False))
-                    if require_same_type is None:
-                        require_same_type = False
-                    
-                    self.grader.compare_with_solution(
-                        solution_file,
-                        variables_to_compare,
-                        tolerance=float(test.get('tolerance', 1e-6)),
-                        require_same_type=require_same_type,
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'test_function_solution':
-                    solution_file = test.get('solution_file')
-                    test_inputs = self.parse_value(test.get('test_inputs'))
-                    
-                    if isinstance(test_inputs, str):
-                        test_inputs = eval(test_inputs, {'np': np, 'numpy': np})
-                    
-                    self.grader.test_function_with_solution(
-                        test['function_name'],
-                        solution_file,
-                        test_inputs,
-                        tolerance=float(test.get('tolerance', 1e-6)),
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'check_relationship':
-                    relationship_str = test.get('relationship')
-                    relationship = eval(relationship_str, {'np': np, 'numpy': np})
-                    
-                    self.grader.check_variable_relationship(
-                        test['var1_name'],
-                        test['var2_name'],
-                        relationship,
-                        tolerance=float(test.get('tolerance', 1e-6)),
-                        description=self.parse_string(test.get('description')),
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'check_multiple_lines':
-                    self.grader.check_multiple_lines(
-                        min_lines=self.parse_int(test.get('min_lines', 1)),
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'check_exact_lines':
-                    self.grader.check_exact_lines(
-                        exact_lines=self.parse_int(test.get('exact_lines', 1)),
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'check_function_any_line':
-                    function_str = test.get('function')
-                    function = eval(function_str, {'np': np, 'numpy': np})
-                    
-                    self.grader.check_function_any_line(
-                        function,
-                        min_length=self.parse_int(test.get('min_length', 1)),
-                        tolerance=float(test.get('tolerance', 1e-6)),
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'array_size':
-                    self.grader.check_array_size(
-                        test['variable_name'],
-                        min_size=self.parse_int(test.get('min_size')),
-                        max_size=self.parse_int(test.get('max_size')),
-                        exact_size=self.parse_int(test.get('exact_size')),
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'array_values_in_range':
-                    self.grader.check_array_values_in_range(
-                        test['variable_name'],
-                        min_value=self.parse_float(test.get('min_value')),
-                        max_value=self.parse_float(test.get('max_value')),
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'plot_has_xlabel':
-                    self.grader.check_plot_has_xlabel(
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'plot_has_ylabel':
-                    self.grader.check_plot_has_ylabel(
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'plot_has_title':
-                    self.grader.check_plot_has_title(
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'plot_line_style':
-                    self.grader.check_plot_line_style(
-                        test['expected_style'],
-                        line_index=self.parse_int(test.get('line_index', 0)),
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'plot_has_line_style':
-                    self.grader.check_plot_has_line_style(
-                        test['expected_style'],
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'plot_line_width':
-                    self.grader.check_plot_line_width(
-                        float(test['expected_width']),
-                        line_index=self.parse_int(test.get('line_index', 0)),
-                        tolerance=float(test.get('tolerance', 0.1)),
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'plot_marker_size':
-                    self.grader.check_plot_marker_size(
-                        float(test['expected_size']),
-                        line_index=self.parse_int(test.get('line_index', 0)),
-                        tolerance=float(test.get('tolerance', 0.5)),
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                elif test_type == 'compare_plot_solution':
-                    self.grader.compare_plot_with_solution(
-                        test['solution_file'],
-                        line_index=self.parse_int(test.get('line_index', 0)),
-                        check_color=self.parse_bool(test.get('check_color', True)),
-                        check_linestyle=self.parse_bool(test.get('check_linestyle', True)),
-                        check_linewidth=self.parse_bool(test.get('check_linewidth', True)),
-                        check_marker=self.parse_bool(test.get('check_marker', True)),
-                        check_markersize=self.parse_bool(test.get('check_markersize', True)),
-                        custom_pass_feedback=custom_pass_feedback,
-                        custom_fail_feedback=custom_fail_feedback
-                    )
-                
-                else:
-                    if test_type:
-                        self.results_text.insert(tk.END, f"\u2717 Unknown test type: {test_type}\n", 'fail')
-                
+                step(self.grader)
             except Exception as e:
-                self.results_text.insert(tk.END, f"\u2717 Error in test: {str(e)}\n", 'fail')
+                self._append_line(f"\u2717 Error in test: {str(e)}\n", 'fail')
+    
+    def compile_test(self, test):
+        """Parse one Excel test row into a callable that takes the grader"""
+        try:
+            return self._compile_test(test)
+        except Exception as e:
+            return partial(self._report_test_error, str(e))
+    
+    def _report_test_error(self, message, grader):
+        """Report a test row that could not be compiled"""
+        self._append_line(f"\u2717 Error in test: {message}\n", 'fail')
+    
+    def _report_unknown_test(self, test_type, grader):
+        """Report a test row with an unrecognized test type"""
+        if test_type:
+            self._append_line(f"\u2717 Unknown test type: {test_type}\n", 'fail')
+    
+    def _compile_test(self, test):
+        """Resolve a test row's handler and pre-parse its arguments"""
+        test_type = test.get('test_type', '').lower()
+        
+        # Get optional custom feedback messages
+        feedback = {
+            'custom_pass_feedback': self.parse_string(test.get('pass_feedback')),
+            'custom_fail_feedback': self.parse_string(test.get('fail_feedback')),
+        }
+        
+        if test_type == 'variable_value':
+            return partial(_grader_step, 'check_variable_value', (
+                test['variable_name'],
+                self.parse_value(test['expected_value']),
+            ), dict(
+                tolerance=float(test.get('tolerance', 1e-6)),
+                **feedback
+            ))
+        
+        elif test_type == 'variable_type':
+            type_map = {
+                'int': int, 'float': float, 'str': str, 
+                'list': list, 'dict': dict, 'tuple': tuple
+            }
+            expected_type = type_map.get(test['expected_value'], str)
+            return partial(_grader_step, 'check_variable_type', (
+                test['variable_name'], 
+                expected_type,
+            ), feedback)
+        
+        elif test_type == 'function_exists':
+            return partial(_grader_step, 'check_function_exists', (
+                test['function_name'],
+            ), feedback)
+        
+        elif test_type == 'function_called':
+            match_any_prefix = self.parse_bool(test.get('match_any_prefix', False))
+            if match_any_prefix is None:
+                match_any_prefix = False
+            return partial(_grader_step, 'check_function_called', (
+                test['function_name'],
+            ), dict(
+                match_any_prefix=match_any_prefix,
+                **feedback
+            ))
+        
+        elif test_type == 'function_not_called':
+            match_any_prefix = self.parse_bool(test.get('match_any_prefix', False))
+            if match_any_prefix is None:
+                match_any_prefix = False
+            return partial(_grader_step, 'check_function_not_called', (
+                test['function_name'],
+            ), dict(
+                match_any_prefix=match_any_prefix,
+                **feedback
+            ))
+        
+        elif test_type == 'for_loop_used':
+            return partial(_grader_step, 'check_for_loop_used', (), feedback)
+        
+        elif test_type == 'while_loop_used':
+            return partial(_grader_step, 'check_while_loop_used', (), feedback)
+        
+        elif test_type == 'if_statement_used':
+            return partial(_grader_step, 'check_if_statement_used', (), feedback)
+        
+        elif test_type == 'operator_used':
+            return partial(_grader_step, 'check_operator_used', (
+                test['operator'],
+            ), feedback)
+        
+        elif test_type == 'code_contains':
+            case_sensitive = test.get('case_sensitive', True)
+            if isinstance(case_sensitive, str):
+                case_sensitive = case_sensitive.lower() in ['true', 'yes', '1']
+            elif pd.isna(case_sensitive):
+                case_sensitive = True
+            
+            return partial(_grader_step, 'check_code_contains', (
+                test['phrase'],
+            ), dict(
+                case_sensitive=bool(case_sensitive),
+                **feedback
+            ))
+        
+        elif test_type == 'plot_created':
+            return partial(_grader_step, 'check_plot_created', (), feedback)
+        
+        elif test_type == 'plot_properties':
+            return partial(_grader_step, 'check_plot_properties', (), dict(
+                title=self.parse_string(test.get('title')),
+                xlabel=self.parse_string(test.get('xlabel')),
+                ylabel=self.parse_string(test.get('ylabel')),
+                has_legend=self.parse_bool(test.get('has_legend')),
+                has_grid=self.parse_bool(test.get('has_grid')),
+                **feedback
+            ))
+        
+        elif test_type == 'plot_data_length':
+            return partial(_grader_step, 'check_plot_data_length', (), dict(
+                min_length=self.parse_int(test.get('min_length')),
+                max_length=self.parse_int(test.get('max_length')),
+                exact_length=self.parse_int(test.get('exact_length')),
+                **feedback
+            ))
+        
+        elif test_type == 'loop_iterations':
+            return partial(_grader_step, 'count_loop_iterations', (
+                test['loop_variable'],
+            ), dict(
+                expected_count=self.parse_int(test.get('expected_count')),
+                **feedback
+            ))
+        
+        elif test_type == 'list_equals':
+            expected_list = self.parse_value(test.get('expected_list'))
+            order_matters = self.parse_bool(test.get('order_matters'))
+            if order_matters is None:
+                order_matters = True
+            
+            return partial(_grader_step, 'check_list_equals', (
+                test['variable_name'],
+                expected_list,
+            ), dict(
+                order_matters=order_matters,
+                tolerance=float(test.get('tolerance', 1e-6)),
+                **feedback
+            ))
+        
+        elif test_type == 'array_equals':
+            expected_array = self.parse_value(test.get('expected_array'))
+            return partial(_grader_step, 'check_array_equals', (
+                test['variable_name'],
+                expected_array,
+            ), dict(
+                tolerance=float(test.get('tolerance', 1e-6)),
+                **feedback
+            ))
+        
+        elif test_type == 'compare_solution':
+            solution_file = test.get('solution_file')
+            variables_to_compare = self.parse_value(test.get('variables_to_compare'))
+            
+            if isinstance(variables_to_compare, str):
+                variables_to_compare = [v.strip() for v in variables_to_compare.split(',')]
+            
+            require_same_type = self.parse_bool(test.get('require_same_type', False))
+            if require_same_type is None:
+                require_same_type = False
+            
+            return partial(_grader_step, 'compare_with_solution', (
+                solution_file,
+                variables_to_compare,
+            ), dict(
+                tolerance=float(test.get('tolerance', 1e-6)),
+                require_same_type=require_same_type,
+                **feedback
+            ))
+        
+        elif test_type == 'test_function_solution':
+            solution_file = test.get('solution_file')
+            test_inputs = self.parse_value(test.get('test_inputs'))
+            
+            if isinstance(test_inputs, str):
+                test_inputs = eval(test_inputs, {'np': np, 'numpy': np})
+            
+            # Student functions may mutate their arguments, so each run gets a fresh copy
+            return partial(_grader_step, 'test_function_with_solution', (
+                test['function_name'],
+                solution_file,
+                test_inputs,
+            ), dict(
+                tolerance=float(test.get('tolerance', 1e-6)),
+                **feedback
+            ), copy_args=True)
+        
+        elif test_type == 'check_relationship':
+            relationship_str = test.get('relationship')
+            relationship = eval(relationship_str, {'np': np, 'numpy': np})
+            
+            return partial(_grader_step, 'check_variable_relationship', (
+                test['var1_name'],
+                test['var2_name'],
+                relationship,
+            ), dict(
+                tolerance=float(test.get('tolerance', 1e-6)),
+                description=self.parse_string(test.get('description')),
+                **feedback
+            ))
+        
+        elif test_type == 'check_multiple_lines':
+            return partial(_grader_step, 'check_multiple_lines', (), dict(
+                min_lines=self.parse_int(test.get('min_lines', 1)),
+                **feedback
+            ))
+        
+        elif test_type == 'check_exact_lines':
+            return partial(_grader_step, 'check_exact_lines', (), dict(
+                exact_lines=self.parse_int(test.get('exact_lines', 1)),
+                **feedback
+            ))
+        
+        elif test_type == 'check_function_any_line':
+            function_str = test.get('function')
+            function = eval(function_str, {'np': np, 'numpy': np})
+            
+            return partial(_grader_step, 'check_function_any_line', (
+                function,
+            ), dict(
+                min_length=self.parse_int(test.get('min_length', 1)),
+                tolerance=float(test.get('tolerance', 1e-6)),
+                **feedback
+            ))
+        
+        elif test_type == 'array_size':
+            return partial(_grader_step, 'check_array_size', (
+                test['variable_name'],
+            ), dict(
+                min_size=self.parse_int(test.get('min_size')),
+                max_size=self.parse_int(test.get('max_size')),
+                exact_size=self.parse_int(test.get('exact_size')),
+                **feedback
+            ))
+        
+        elif test_type == 'array_values_in_range':
+            return partial(_grader_step, 'check_array_values_in_range', (
+                test['variable_name'],
+            ), dict(
+                min_value=self.parse_float(test.get('min_value')),
+                max_value=self.parse_float(test.get('max_value')),
+                **feedback
+            ))
+        
+        elif test_type == 'plot_has_xlabel':
+            return partial(_grader_step, 'check_plot_has_xlabel', (), feedback)
+        
+        elif test_type == 'plot_has_ylabel':
+            return partial(_grader_step, 'check_plot_has_ylabel', (), feedback)
+        
+        elif test_type == 'plot_has_title':
+            return partial(_grader_step, 'check_plot_has_title', (), feedback)
+        
+        elif test_type == 'plot_line_style':
+            return partial(_grader_step, 'check_plot_line_style', (
+                test['expected_style'],
+            ), dict(
+                line_index=self.parse_int(test.get('line_index', 0)),
+                **feedback
+            ))
+        
+        elif test_type == 'plot_has_line_style':
+            return partial(_grader_step, 'check_plot_has_line_style', (
+                test['expected_style'],
+            ), feedback)
+        
+        elif test_type == 'plot_line_width':
+            return partial(_grader_step, 'check_plot_line_width', (
+                float(test['expected_width']),
+            ), dict(
+                line_index=self.parse_int(test.get('line_index', 0)),
+                tolerance=float(test.get('tolerance', 0.1)),
+                **feedback
+            ))
+        
+        elif test_type == 'plot_marker_size':
+            return partial(_grader_step, 'check_plot_marker_size', (
+                float(test['expected_size']),
+            ), dict(
+                line_index=self.parse_int(test.get('line_index', 0)),
+                tolerance=float(test.get('tolerance', 0.5)),
+                **feedback
+            ))
+        
+        elif test_type == 'compare_plot_solution':
+            return partial(_grader_step, 'compare_plot_with_solution', (
+                test['solution_file'],
+            ), dict(
+                line_index=self.parse_int(test.get('line_index', 0)),
+                check_color=self.parse_bool(test.get('check_color', True)),
+                check_linestyle=self.parse_bool(test.get('check_linestyle', True)),
+                check_linewidth=self.parse_bool(test.get('check_linewidth', True)),
+                check_marker=self.parse_bool(test.get('check_marker', True)),
+                check_markersize=self.parse_bool(test.get('check_markersize', True)),
+                **feedback
+            ))
+        
+        return partial(self._report_unknown_test, test_type)
     
     def parse_value(self, value):
         """Parse string value to appropriate Python type"""
@@ -718,54 +776,61 @@ class AutoGraderGUI:
         except:
             return None
     
-    def display_header(self):
+    def display_header(self, student_name, assignment_name, filepath):
         """Display header information"""
-        self.results_text.insert(tk.END, "="*70 + "\n", 'header')
-        self.results_text.insert(tk.END, "AUTOGRADER RESULTS\n", 'header')
-        self.results_text.insert(tk.END, "="*70 + "\n", 'header')
-        self.results_text.insert(tk.END, f"Student: {self.student_name.get()}\n")
-        self.results_text.insert(tk.END, f"Assignment: {self.selected_assignment.get()}\n")
-        self.results_text.insert(tk.END, f"File: {os.path.basename(self.selected_file.get())}\n")
-        self.results_text.insert(tk.END, f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        self.results_text.insert(tk.END, "="*70 + "\n")
+        self._append_line("="*70 + "\n", 'header')
+        self._append_line("AUTOGRADER RESULTS\n", 'header')
+        self._append_line("="*70 + "\n", 'header')
+        self._append_line(f"Student: {student_name}\n")
+        self._append_line(f"Assignment: {assignment_name}\n")
+        self._append_line(f"File: {os.path.basename(filepath)}\n")
+        self._append_line(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        self._append_line("="*70 + "\n")
         
         self.capture_grader_output()
     
     def capture_grader_output(self):
         """Redirect grader print statements to GUI"""
         from io import StringIO
+        self._saved_stdout = sys.stdout
         sys.stdout = StringIO()
     
+    def restore_grader_output(self):
+        """Put back the stdout replaced by capture_grader_output, if it is still captured"""
+        if self._saved_stdout is not None:
+            sys.stdout = self._saved_stdout
+            self._saved_stdout = None
+    
     def display_summary(self):
         """Display test summary"""
         summary = self.grader.get_summary()
         
         output = sys.stdout.getvalue()
-        sys.stdout = sys.__stdout__
+        self.restore_grader_output()
         
         for line in output.split('\n'):
             if '\u2713 PASS' in line or 'PASS:' in line:
-                self.results_text.insert(tk.END, line + '\n', 'pass')
+                self._append_line(line + '\n', 'pass')
             elif '\u2717 FAIL' in line or 'FAIL:' in line:
-                self.results_text.insert(tk.END, line + '\n', 'fail')
+                self._append_line(line + '\n', 'fail')
             else:
-                self.results_text.insert(tk.END, line + '\n')
-        
-        self.results_text.insert(tk.END, "\n" + "="*70 + "\n", 'header')
-        self.results_text.insert(tk.END, "SUMMARY\n", 'header')
-        self.results_text.insert(tk.END, "="*70 + "\n", 'header')
-        self.results_text.insert(tk.END, f"Total Tests: {summary['total_tests']}\n")
-        self.results_text.insert(tk.END, f"Passed: {summary['passed']}\n", 'pass')
-        self.results_text.insert(tk.END, f"Failed: {summary['failed']}\n", 'fail')
-        self.results_text.insert(tk.END, f"Success Rate: {summary['success_rate']:.1f}%\n")
-        self.results_text.insert(tk.END, "="*70 + "\n")
+                self._append_line(line + '\n')
+        
+        self._append_line("\n" + "="*70 + "\n", 'header')
+        self._append_line("SUMMARY\n", 'header')
+        self._append_line("="*70 + "\n", 'header')
+        self._append_line(f"Total Tests: {summary['total_tests']}\n")
+        self._append_line(f"Passed: {summary['passed']}\n", 'pass')
+        self._append_line(f"Failed: {summary['failed']}\n", 'fail')
+        self._append_line(f"Success Rate: {summary['success_rate']:.1f}%\n")
+        self._append_line("="*70 + "\n")
     
-    def send_email(self):
+    def send_email(self, student_name, assignment_name, filepath):
         """Send results via email"""
         try:
             if not self.config:
                 if self.debug_mode:
-                    self.results_text.insert(tk.END, "\nNote: Email not configured.\n")
+                    self._append_line("\nNote: Email not configured.\n")
                 return
             
             sender_email = self.config.get('email', 'sender_email', fallback='')
@@ -774,7 +839,7 @@ class AutoGraderGUI:
             
             if not sender_email or not sender_password or not instructor_email:
                 if self.debug_mode:
-                    self.results_text.insert(tk.END, "\nNote: Email not fully configured.\n")
+                    self._append_line("\nNote: Email not fully configured.\n")
                 return
             
             msg = MIMEMultipart()
@@ -782,26 +847,27 @@ class AutoGraderGUI:
             msg['To'] = instructor_email
             
             timestamp = datetime.now()
-            subject = f"{self.selected_assignment.get()}, {self.student_name.get()}, {timestamp.strftime('%Y-%m-%d')}, {timestamp.strftime('%H:%M:%S')}"
+            subject = f"{assignment_name}, {student_name}, {timestamp.strftime('%Y-%m-%d')}, {timestamp.strftime('%H:%M:%S')}"
             msg['Subject'] = subject
             
-            # Read student's code
-            with open(self.selected_file.get(), 'r', encoding='utf-8') as f:
-                student_code = f.read()
+            # Reuse the student's code read by check_code
+            student_code = self._script_source
+            if student_code is None:
+                student_code = self._script_bytes.decode('utf-8', 'replace')
             
             body = f"""AutoGrader Submission
 
-Student Name: {self.student_name.get()}
+Student Name: {student_name}
 Computer Name: {self.computer_name}
 Username: {self.username}
-Assignment: {self.selected_assignment.get()}
-File: {os.path.basename(self.selected_file.get())}
+Assignment: {assignment_name}
+File: {os.path.basename(filepath)}
 Submission Date: {timestamp.strftime('%Y-%m-%d %H:%M:%S')}
 
 {'='*70}
 RESULTS
 {'='*70}
-{self.results_text.get(1.0, tk.END)}
+{''.join(self._results_log)}
 
 {'='*70}
 STUDENT CODE
@@ -811,15 +877,14 @@ STUDENT CODE
             msg.attach(MIMEText(body, 'plain'))
             
             # Also attach the file
-            with open(self.selected_file.get(), 'rb') as f:
-                part = MIMEBase('application', 'octet-stream')
-                part.set_payload(f.read())
-                encoders.encode_base64(part)
-                part.add_header(
-                    'Content-Disposition',
-                    f'attachment; filename={os.path.basename(self.selected_file.get())}'
-                )
-                msg.attach(part)
+            part = MIMEBase('application', 'octet-stream')
+            part.set_payload(self._script_bytes)
+            encoders.encode_base64(part)
+            part.add_header(
+                'Content-Disposition',
+                f'attachment; filename={os.path.basename(filepath)}'
+            )
+            msg.attach(part)
             
             smtp_server = self.config.get('email', 'smtp_server')
             smtp_port = self.config.getint('email', 'smtp_port')
@@ -830,11 +895,11 @@ STUDENT CODE
                 server.send_message(msg)
             
             if self.debug_mode:
-                self.results_text.insert(tk.END, "\n\u2713 Results emailed to instructor!\n", 'pass')
+                self._append_line("\n\u2713 Results emailed to instructor!\n", 'pass')
             
         except Exception as e:
             if self.debug_mode:
-                self.results_text.insert(tk.END, f"\n\u2717 Failed to send email: {str(e)}\n", 'fail')
+                self._append_line(f"\n\u2717 Failed to send email: {str(e)}\n", 'fail')
     
     def export_to_pdf(self):
         """Export code and results to PDF"""
@@ -1,13 +1,38 @@
 import os
 import sys
 import ast
+import math
+import queue
+import random
 import threading
-import matplotlib
-matplotlib.use('Agg')  # Non-interactive backend
-import matplotlib.pyplot as plt
+import numpy as np
+from collections import Counter
 from typing import Any, List, Dict, Optional, Callable, Union
 
 
+class _LazyPyplot:
+    """Stand-in for matplotlib.pyplot that imports it on first attribute access."""
+    _module = None
+    
+    def _load(self):
+        if _LazyPyplot._module is None:
+            import matplotlib
+            matplotlib.use('Agg')  # Non-interactive backend
+            import matplotlib.pyplot
+            _LazyPyplot._module = matplotlib.pyplot
+        return _LazyPyplot._module
+    
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+    
+    def __dir__(self):
+        return dir(self._load())
+
+
+# pyplot pulls in a large dependency tree; defer it until grading actually runs
+plt = _LazyPyplot()
+
+
 def get_resource_path(relative_path):
     """Get the absolute path to a resource, works for dev and PyInstaller bundle."""
     # Normalize path separators
@@ -45,25 +70,48 @@ class TimeoutException(Exception):
     pass
 
 
+# Single daemon thread that runs timed code; replaced if a call times out
+_worker_tasks: Optional[queue.Queue] = None
+_worker_lock = threading.Lock()
+
+
+def _worker_loop(tasks):
+    """Run queued callables forever, signalling each caller as soon as its call returns."""
+    while True:
+        func, args, kwargs, result, done = tasks.get()
+        try:
+            result[0] = func(*args, **kwargs)
+        except Exception as e:
+            result[0] = e
+        except BaseException:
+            pass  # e.g. SystemExit from student code; keep the worker alive
+        finally:
+            done.set()
+
+
 def run_with_timeout(func, args=(), kwargs=None, timeout=10):
     """Run a function with a timeout (cross-platform)."""
+    global _worker_tasks
     if kwargs is None:
         kwargs = {}
     
-    result = [TimeoutException("Code execution timed out")]
-    
-    def target():
-        try:
-            result[0] = func(*args, **kwargs)
-        except Exception as e:
-            result[0] = e
+    with _worker_lock:
+        if _worker_tasks is None:
+            _worker_tasks = queue.Queue()
+            thread = threading.Thread(target=_worker_loop, args=(_worker_tasks,))
+            thread.daemon = True
+            thread.start()
+        tasks = _worker_tasks
     
-    thread = threading.Thread(target=target)
-    thread.daemon = True
-    thread.start()
-    thread.join(timeout)
+    result = [TimeoutException("Code execution timed out")]
+    done = threading.Event()
+    tasks.put((func, args, kwargs, result, done))
     
-    if thread.is_alive():
+    if not done.wait(timeout):
+        # The worker is stuck in the timed-out code, so abandon it and start fresh next time
+        with _worker_lock:
+            if _worker_tasks is tasks:
+                _worker_tasks = None
         raise TimeoutException(f"Code execution timed out after {timeout} seconds")
     
     if isinstance(result[0], Exception):
@@ -72,44 +120,209 @@ def run_with_timeout(func, args=(), kwargs=None, timeout=10):
     return result[0]
 
 
+# Operator spellings accepted by check_operator_used and their AST op classes
+_OPERATOR_MAP = {
+    '+=': ast.Add, '-=': ast.Sub, '*=': ast.Mult, '/=': ast.Div,
+    '//=': ast.FloorDiv, '%=': ast.Mod, '**=': ast.Pow,
+    '+': ast.Add, '-': ast.Sub, '*': ast.Mult, '/': ast.Div,
+    '//': ast.FloorDiv, '%': ast.Mod, '**': ast.Pow,
+    '==': ast.Eq, '!=': ast.NotEq, '<': ast.Lt, '<=': ast.LtE,
+    '>': ast.Gt, '>=': ast.GtE, 'and': ast.And, 'or': ast.Or, 'not': ast.Not,
+}
+_AUG_OPERATORS = frozenset(['+=', '-=', '*=', '/=', '//=', '%=', '**='])
+_SINGLE_OP_NODES = frozenset([ast.BinOp, ast.BoolOp, ast.UnaryOp])
+
+# Keywords check_code_contains can answer exactly from the node kinds in the AST.
+# 'if' is left out: comprehension filters and match guards have no node of their own.
+_KEYWORD_NODES = {
+    'for': (ast.For, ast.AsyncFor, ast.comprehension),
+    'while': (ast.While,),
+    'return': (ast.Return,),
+    'def': (ast.FunctionDef, ast.AsyncFunctionDef),
+    'class': (ast.ClassDef,),
+    'import': (ast.Import, ast.ImportFrom),
+    'lambda': (ast.Lambda,),
+}
+
+# Sentinel for variables the student never assigned (None is a legitimate value)
+_MISSING = object()
+
+# numpy integer and float scalars (np.int64, np.float32, ...) do not subclass int/float
+_NUM_TYPES = (int, float, np.integer, np.floating)
+
+
+def _is_num(value) -> bool:
+    """Return True for Python or numpy real scalars."""
+    return isinstance(value, _NUM_TYPES)
+
+
+def _fast_allclose(a, b, atol) -> bool:
+    """np.allclose that rejects shape mismatches and skips the arithmetic for identical arrays."""
+    a = np.asarray(a)
+    b = np.asarray(b)
+    if a.shape != b.shape:
+        return False
+    if a.dtype == b.dtype and np.array_equal(a, b):
+        return True
+    return np.allclose(a, b, atol=atol)
+
+
+class _PltWrapper:
+    """Wrapper for matplotlib.pyplot that disables show()"""
+    def __init__(self, plt_module):
+        self._plt = plt_module
+    
+    def __getattr__(self, name):
+        if name == 'show':
+            # Return a no-op function for show()
+            return lambda *args, **kwargs: None
+        return getattr(self._plt, name)
+    
+    def __dir__(self):
+        return dir(self._plt)
+
+
+# Built once; each execution gets a copy with its own __file__
+_SAFE_BUILTINS_TEMPLATE: Dict[str, Any] = {
+    '__import__': __import__,
+    '__name__': '__main__',
+    'print': print, 'len': len, 'range': range, 'enumerate': enumerate,
+    'zip': zip, 'map': map, 'filter': filter, 'sorted': sorted,
+    'sum': sum, 'min': min, 'max': max, 'abs': abs, 'round': round,
+    'pow': pow, 'divmod': divmod, 'all': all, 'any': any,
+    'int': int, 'float': float, 'str': str, 'bool': bool,
+    'list': list, 'dict': dict, 'tuple': tuple, 'set': set,
+    'frozenset': frozenset,
+    'isinstance': isinstance, 'type': type, 'hasattr': hasattr,
+    'getattr': getattr, 'setattr': setattr,
+    'reversed': reversed, 'slice': slice,
+    'math': math, 'random': random, 'np': np, 'plt': _PltWrapper(plt),
+    'Exception': Exception, 'ValueError': ValueError,
+    'TypeError': TypeError, 'IndexError': IndexError,
+    'KeyError': KeyError, 'AttributeError': AttributeError,
+    'ZeroDivisionError': ZeroDivisionError,
+}
+
+
 class AutoGrader:
     """Comprehensive autograder for Python scripts and functions."""
     
-    def __init__(self, filepath: str = None, timeout: int = 10):
-        """Initialize the AutoGrader."""
+    def __init__(self, filepath: str = None, timeout: int = 10, source: Optional[str] = None):
+        """Initialize the AutoGrader. Pass source to skip re-reading an already loaded file."""
         self.filepath = filepath
         self.timeout = timeout
         self._content = None
+        self._content_lower = None
         self._ast_tree = None
+        self._code = None
+        self._defined_funcs: set = set()
+        self._called_full_names: set = set()
+        self._called_leaf_names: Dict[str, str] = {}
+        self._node_kinds: set = set()
+        self._aug_ops: set = set()
+        self._expr_ops: set = set()
+        self._solution_code: Dict[tuple, Any] = {}
+        self._solution_namespaces: Dict[tuple, Dict[str, Any]] = {}
         self.captured_vars: Dict[str, Any] = {}
         self.execution_namespace: Dict[str, Any] = {}
         self._execution_successful = False
         self.test_results = []
+        self._passed_count = 0
         
         if filepath:
-            self._load_file()
+            self._load_file(source)
     
-    def _load_file(self) -> bool:
+    def _load_file(self, source: Optional[str] = None) -> bool:
         """Load and parse the student's code file."""
-        if not os.path.exists(self.filepath):
+        if source is None and not os.path.exists(self.filepath):
             self._log_result(False, f"File not found: {self.filepath}")
             return False
         
         try:
-            with open(self.filepath, 'r', encoding='utf-8') as f:
-                self._content = f.read()
+            if source is not None:
+                self._content = source
+            else:
+                with open(self.filepath, 'r', encoding='utf-8') as f:
+                    self._content = f.read()
             
             try:
                 self._ast_tree = ast.parse(self._content)
+                self._index_ast()
             except SyntaxError as e:
                 self._log_result(False, f"Syntax error in code: {e}")
                 return False
             
+            # Some code parses but does not compile (e.g. 'return' outside a function).
+            # Leave _code unset and let execute_script report that error once.
+            try:
+                self._code = compile(self._ast_tree, self.filepath or '<student>', 'exec')
+            except SyntaxError:
+                self._code = None
+            
             return True
         except Exception as e:
             self._log_result(False, f"Could not read file: {e}")
             return False
     
+    def _index_ast(self):
+        """Walk the AST once, recording node kinds, defined functions, calls made and operators used."""
+        # Same breadth-first order as ast.walk, but a for loop over a growing list
+        # avoids resuming a generator and a deque for every node
+        nodes = [self._ast_tree]
+        for node in nodes:
+            nodes.extend(ast.iter_child_nodes(node))
+            # Dispatch on the exact node class; AST node classes are never subclassed
+            kind = type(node)
+            self._node_kinds.add(kind)
+            if kind is ast.FunctionDef:
+                self._defined_funcs.add(node.name)
+            elif kind is ast.Call:
+                full_name = self._get_full_function_name_from_call(node)
+                self._called_full_names.add(full_name)
+                # Keep the first call seen for each final name in breadth-first order
+                leaf_name = self._get_function_name_from_call(node)
+                self._called_leaf_names.setdefault(leaf_name, full_name)
+            elif kind is ast.AugAssign:
+                self._aug_ops.add(type(node.op))
+            elif kind in _SINGLE_OP_NODES:
+                self._expr_ops.add(type(node.op))
+            elif kind is ast.Compare:
+                self._expr_ops.update(type(op) for op in node.ops)
+    
+    def _compile_solution(self, solution_path: str):
+        """Read and compile a solution file, reusing the code object until the file changes."""
+        cache_key = (solution_path, os.path.getmtime(solution_path))
+        if cache_key not in self._solution_code:
+            with open(solution_path, 'r', encoding='utf-8') as f:
+                self._solution_code[cache_key] = compile(f.read(), solution_path, 'exec')
+        return self._solution_code[cache_key]
+    
+    def _get_solution_namespace(self, solution_path: str):
+        """Run a solution file once and reuse its namespace until the file changes.
+        
+        Returns (namespace, executed), where executed tells the caller whether the
+        solution just ran and the student's plots need restoring.
+        """
+        cache_key = (solution_path, os.path.getmtime(solution_path))
+        if cache_key in self._solution_namespaces:
+            return self._solution_namespaces[cache_key], False
+        
+        solution_code = self._compile_solution(solution_path)
+        
+        # Close figures before running solution to avoid contamination
+        plt.close('all')
+        
+        safe_builtins = self._get_safe_builtins()
+        solution_namespace = {'__builtins__': safe_builtins}
+        
+        def execute_solution():
+            exec(solution_code, solution_namespace)
+        
+        run_with_timeout(execute_solution, timeout=self.timeout)
+        
+        self._solution_namespaces[cache_key] = solution_namespace
+        return solution_namespace, True
+    
     def _log_result(self, passed: bool, message: str, 
                     custom_pass_feedback: Optional[str] = None,
                     custom_fail_feedback: Optional[str] = None):
@@ -125,6 +338,8 @@ class AutoGrader:
             display_message = message
         
         print(f"{checkmark} {status}: {display_message}")
+        if passed:
+            self._passed_count += 1
         self.test_results.append({
             "passed": passed, 
             "message": display_message,
@@ -146,8 +361,11 @@ class AutoGrader:
         safe_builtins = self._get_safe_builtins()
         self.execution_namespace = {'__builtins__': safe_builtins}
         
+        # Fall back to the raw source so syntax errors surface as execution failures
+        code = self._code if self._code is not None else self._content
+        
         def execute_code():
-            exec(self._content, self.execution_namespace, self.execution_namespace)
+            exec(code, self.execution_namespace)
         
         # Save current working directory and change to student file's directory
         original_cwd = os.getcwd()
@@ -164,12 +382,14 @@ class AutoGrader:
             if variables_to_capture is None:
                 self.captured_vars = {
                     k: v for k, v in self.execution_namespace.items() 
-                    if not k.startswith('_') and k != '__builtins__'
+                    if not k.startswith('_')
                 }
             else:
+                # Leave out names the script never assigned so checks report them as missing
                 self.captured_vars = {
-                    var: self.execution_namespace.get(var, None) 
+                    var: self.execution_namespace[var] 
                     for var in variables_to_capture
+                    if var in self.execution_namespace
                 }
             
             self._execution_successful = True
@@ -230,48 +450,7 @@ class AutoGrader:
     
     def _get_safe_builtins(self) -> Dict[str, Any]:
         """Return a dictionary of safe built-in functions."""
-        import math
-        import random
-        import numpy as np
-        import matplotlib.pyplot as plt_original
-        
-        # Create a wrapper module for plt that makes show() a no-op
-        class PltWrapper:
-            """Wrapper for matplotlib.pyplot that disables show()"""
-            def __init__(self, plt_module):
-                self._plt = plt_module
-            
-            def __getattr__(self, name):
-                if name == 'show':
-                    # Return a no-op function for show()
-                    return lambda *args, **kwargs: None
-                return getattr(self._plt, name)
-            
-            def __dir__(self):
-                return dir(self._plt)
-        
-        plt_wrapper = PltWrapper(plt_original)
-        
-        return {
-            '__import__': __import__,
-            '__name__': '__main__',
-            '__file__': self.filepath if self.filepath else '<string>',
-            'print': print, 'len': len, 'range': range, 'enumerate': enumerate,
-            'zip': zip, 'map': map, 'filter': filter, 'sorted': sorted,
-            'sum': sum, 'min': min, 'max': max, 'abs': abs, 'round': round,
-            'pow': pow, 'divmod': divmod, 'all': all, 'any': any,
-            'int': int, 'float': float, 'str': str, 'bool': bool,
-            'list': list, 'dict': dict, 'tuple': tuple, 'set': set,
-            'frozenset': frozenset,
-            'isinstance': isinstance, 'type': type, 'hasattr': hasattr,
-            'getattr': getattr, 'setattr': setattr,
-            'reversed': reversed, 'slice': slice,
-            'math': math, 'random': random, 'np': np, 'plt': plt_wrapper,
-            'Exception': Exception, 'ValueError': ValueError,
-            'TypeError': TypeError, 'IndexError': IndexError,
-            'KeyError': KeyError, 'AttributeError': AttributeError,
-            'ZeroDivisionError': ZeroDivisionError,
-        }
+        return {**_SAFE_BUILTINS_TEMPLATE, '__file__': self.filepath if self.filepath else '<string>'}
 
     # ======================== VARIABLE CHECKING ========================
     
@@ -284,21 +463,18 @@ class AutoGrader:
                            custom_fail_feedback=custom_fail_feedback)
             return False
         
-        if var_name not in self.captured_vars:
+        actual_value = self.captured_vars.get(var_name, _MISSING)
+        if actual_value is _MISSING:
             self._log_result(False, f"Variable '{var_name}' not found",
                            custom_fail_feedback=custom_fail_feedback)
             return False
         
-        actual_value = self.captured_vars[var_name]
-        
         if actual_value is None and expected_value is None:
             self._log_result(True, f"'{var_name}' is None as expected",
                            custom_pass_feedback=custom_pass_feedback)
             return True
         
-        import numpy as np
-        
-        if isinstance(expected_value, (int, float)) and isinstance(actual_value, (int, float)):
+        if _is_num(expected_value) and _is_num(actual_value):
             if abs(actual_value - expected_value) <= tolerance:
                 self._log_result(True, f"'{var_name}' = {actual_value}",
                                custom_pass_feedback=custom_pass_feedback)
@@ -310,7 +486,7 @@ class AutoGrader:
         
         if isinstance(expected_value, (list, tuple, np.ndarray)) and isinstance(actual_value, (list, tuple, np.ndarray)):
             try:
-                if np.allclose(actual_value, expected_value, atol=tolerance):
+                if _fast_allclose(actual_value, expected_value, atol=tolerance):
                     self._log_result(True, f"'{var_name}' matches expected",
                                    custom_pass_feedback=custom_pass_feedback)
                     return True
@@ -318,7 +494,7 @@ class AutoGrader:
                     self._log_result(False, f"'{var_name}' does not match expected",
                                    custom_fail_feedback=custom_fail_feedback)
                     return False
-            except:
+            except (TypeError, ValueError):
                 pass
         
         if actual_value == expected_value:
@@ -334,17 +510,18 @@ class AutoGrader:
                             custom_pass_feedback: Optional[str] = None,
                             custom_fail_feedback: Optional[str] = None) -> bool:
         """Check if a variable has the expected type."""
-        if var_name not in self.captured_vars:
+        actual_value = self.captured_vars.get(var_name, _MISSING)
+        if actual_value is _MISSING:
             self._log_result(False, f"Variable '{var_name}' not found",
                            custom_fail_feedback=custom_fail_feedback)
             return False
         
-        if isinstance(self.captured_vars[var_name], expected_type):
+        if isinstance(actual_value, expected_type):
             self._log_result(True, f"'{var_name}' is of type {expected_type.__name__}",
                            custom_pass_feedback=custom_pass_feedback)
             return True
         else:
-            actual_type = type(self.captured_vars[var_name])
+            actual_type = type(actual_value)
             self._log_result(False, f"'{var_name}' is {actual_type.__name__}, expected {expected_type.__name__}",
                            custom_fail_feedback=custom_fail_feedback)
             return False
@@ -359,14 +536,12 @@ class AutoGrader:
                            custom_fail_feedback=custom_fail_feedback)
             return False
         
-        if var_name not in self.captured_vars:
+        actual_value = self.captured_vars.get(var_name, _MISSING)
+        if actual_value is _MISSING:
             self._log_result(False, f"Variable '{var_name}' not found",
                            custom_fail_feedback=custom_fail_feedback)
             return False
         
-        actual_value = self.captured_vars[var_name]
-        
-        import numpy as np
         if isinstance(actual_value, np.ndarray):
             actual_size = actual_value.size
         elif isinstance(actual_value, (list, tuple)):
@@ -416,14 +591,12 @@ class AutoGrader:
                            custom_fail_feedback=custom_fail_feedback)
             return False
         
-        if var_name not in self.captured_vars:
+        actual_value = self.captured_vars.get(var_name, _MISSING)
+        if actual_value is _MISSING:
             self._log_result(False, f"Variable '{var_name}' not found",
                            custom_fail_feedback=custom_fail_feedback)
             return False
         
-        actual_value = self.captured_vars[var_name]
-        
-        import numpy as np
         if isinstance(actual_value, np.ndarray):
             values = actual_value.flatten()
         elif isinstance(actual_value, (list, tuple)):
@@ -467,14 +640,12 @@ class AutoGrader:
                            custom_fail_feedback=custom_fail_feedback)
             return False
         
-        if var_name not in self.captured_vars:
+        actual_value = self.captured_vars.get(var_name, _MISSING)
+        if actual_value is _MISSING:
             self._log_result(False, f"Variable '{var_name}' not found",
                            custom_fail_feedback=custom_fail_feedback)
             return False
         
-        actual_value = self.captured_vars[var_name]
-        import numpy as np
-        
         if not isinstance(actual_value, (list, tuple, np.ndarray)):
             self._log_result(False, f"'{var_name}' is not a list/array",
                            custom_fail_feedback=custom_fail_feedback)
@@ -482,20 +653,30 @@ class AutoGrader:
         
         if order_matters:
             try:
-                if np.allclose(actual_value, expected_list, atol=tolerance):
-                    self._log_result(True, f"'{var_name}' equals expected list",
-                                   custom_pass_feedback=custom_pass_feedback)
-                    return True
-            except:
-                if list(actual_value) == list(expected_list):
+                if _fast_allclose(actual_value, expected_list, atol=tolerance):
                     self._log_result(True, f"'{var_name}' equals expected list",
                                    custom_pass_feedback=custom_pass_feedback)
                     return True
+            except (TypeError, ValueError):
+                # A length mismatch can never be equal, and lists need no copying
+                if len(actual_value) == len(expected_list):
+                    actual_items = actual_value if type(actual_value) is list else list(actual_value)
+                    expected_items = expected_list if type(expected_list) is list else list(expected_list)
+                    if actual_items == expected_items:
+                        self._log_result(True, f"'{var_name}' equals expected list",
+                                       custom_pass_feedback=custom_pass_feedback)
+                        return True
             self._log_result(False, f"'{var_name}' does not equal expected list",
                            custom_fail_feedback=custom_fail_feedback)
             return False
         else:
-            if sorted(list(actual_value)) == sorted(list(expected_list)):
+            try:
+                same_elements = Counter(actual_value) == Counter(expected_list)
+            except TypeError:
+                # Unhashable elements such as nested lists still need sorting
+                same_elements = sorted(list(actual_value)) == sorted(list(expected_list))
+            
+            if same_elements:
                 self._log_result(True, f"'{var_name}' contains expected elements",
                                custom_pass_feedback=custom_pass_feedback)
                 return True
@@ -512,14 +693,12 @@ class AutoGrader:
                            custom_fail_feedback=custom_fail_feedback)
             return False
         
-        if var_name not in self.captured_vars:
+        actual_value = self.captured_vars.get(var_name, _MISSING)
+        if actual_value is _MISSING:
             self._log_result(False, f"Variable '{var_name}' not found",
                            custom_fail_feedback=custom_fail_feedback)
             return False
         
-        actual_value = self.captured_vars[var_name]
-        import numpy as np
-        
         if isinstance(actual_value, (list, tuple)):
             actual_value = np.array(actual_value)
         elif not isinstance(actual_value, np.ndarray):
@@ -535,12 +714,24 @@ class AutoGrader:
                            custom_fail_feedback=custom_fail_feedback)
             return False
         
-        if np.allclose(actual_value, expected_array, atol=tolerance):
+        if _fast_allclose(actual_value, expected_array, atol=tolerance):
             self._log_result(True, f"'{var_name}' array equals expected",
                            custom_pass_feedback=custom_pass_feedback)
             return True
-        self._log_result(False, f"'{var_name}' array does not equal expected",
-                       custom_fail_feedback=custom_fail_feedback)
+        
+        # Only locate the mismatch once we know the arrays differ. Work in float so
+        # bool arrays can be subtracted and unsigned ints cannot wrap around.
+        try:
+            differences = np.abs(np.asarray(actual_value, dtype=float) - np.asarray(expected_array, dtype=float))
+        except (TypeError, ValueError):
+            self._log_result(False, f"'{var_name}' array does not equal expected",
+                           custom_fail_feedback=custom_fail_feedback)
+            return False
+        idx = tuple(int(i) for i in np.unravel_index(np.argmax(differences), differences.shape))
+        self._log_result(False,
+            f"'{var_name}' array does not equal expected: at index {idx} got {actual_value[idx]}, "
+            f"expected {expected_array[idx]} (diff {differences[idx]:.2e})",
+            custom_fail_feedback=custom_fail_feedback)
         return False
     
     def compare_with_solution(self, solution_file: str, variables_to_compare: list, 
@@ -569,19 +760,7 @@ class AutoGrader:
             if solution_dir:
                 os.chdir(solution_dir)
             
-            with open(solution_path, 'r', encoding='utf-8') as f:
-                solution_content = f.read()
-            
-            # Close figures before running solution to avoid contamination
-            plt.close('all')
-            
-            safe_builtins = self._get_safe_builtins()
-            solution_namespace = {'__builtins__': safe_builtins}
-            
-            def execute_solution():
-                exec(solution_content, solution_namespace, solution_namespace)
-            
-            run_with_timeout(execute_solution, timeout=self.timeout)
+            solution_namespace, executed = self._get_solution_namespace(solution_path)
             
             all_match = True
             for var_name in variables_to_compare:
@@ -606,8 +785,9 @@ class AutoGrader:
                 if not match:
                     all_match = False
             
-            # Restore student's plot state
-            self._restore_student_plot()
+            # Restore student's plot state if the solution replaced it
+            if executed:
+                self._restore_student_plot()
             
             return all_match
             
@@ -630,8 +810,6 @@ class AutoGrader:
                                  custom_pass_feedback: Optional[str] = None,
                                  custom_fail_feedback: Optional[str] = None) -> bool:
         """Detailed comparison with element-wise checking for arrays/lists."""
-        import numpy as np
-        
         student_is_array = isinstance(student_value, np.ndarray)
         student_is_list = isinstance(student_value, (list, tuple))
         solution_is_array = isinstance(solution_value, np.ndarray)
@@ -652,7 +830,7 @@ class AutoGrader:
             try:
                 student_arr = np.array(student_value)
                 solution_arr = np.array(solution_value)
-            except:
+            except (TypeError, ValueError):
                 self._log_result(False, f"'{var_name}' could not be converted for comparison",
                                custom_fail_feedback=custom_fail_feedback)
                 return False
@@ -678,8 +856,8 @@ class AutoGrader:
                             f"'{var_name}' differs at index {first_idx}: got {student_arr[first_idx]}, expected {solution_arr[first_idx]}",
                             custom_fail_feedback=custom_fail_feedback)
                     return False
-            except:
-                if np.allclose(student_arr, solution_arr, atol=tolerance):
+            except (TypeError, ValueError):
+                if _fast_allclose(student_arr, solution_arr, atol=tolerance):
                     self._log_result(True, f"'{var_name}' matches solution",
                                    custom_pass_feedback=custom_pass_feedback)
                     return True
@@ -687,7 +865,7 @@ class AutoGrader:
                                custom_fail_feedback=custom_fail_feedback)
                 return False
         
-        if isinstance(solution_value, (int, float)) and isinstance(student_value, (int, float)):
+        if _is_num(solution_value) and _is_num(student_value):
             if abs(student_value - solution_value) <= tolerance:
                 self._log_result(True, f"'{var_name}' matches solution",
                                custom_pass_feedback=custom_pass_feedback)
@@ -714,11 +892,10 @@ class AutoGrader:
             self._log_result(False, "AST not available", custom_fail_feedback=custom_fail_feedback)
             return False
         
-        for node in ast.walk(self._ast_tree):
-            if isinstance(node, ast.FunctionDef) and node.name == func_name:
-                self._log_result(True, f"Function '{func_name}' is defined",
-                               custom_pass_feedback=custom_pass_feedback)
-                return True
+        if func_name in self._defined_funcs:
+            self._log_result(True, f"Function '{func_name}' is defined",
+                           custom_pass_feedback=custom_pass_feedback)
+            return True
         
         self._log_result(False, f"Function '{func_name}' not found",
                        custom_fail_feedback=custom_fail_feedback)
@@ -758,25 +935,16 @@ class AutoGrader:
         func_parts = func_name.split('.')
         final_name = func_parts[-1]
         
-        for node in ast.walk(self._ast_tree):
-            if isinstance(node, ast.Call):
-                if match_any_prefix:
-                    call_name = self._get_function_name_from_call(node)
-                    if call_name == final_name:
-                        full_name = self._get_full_function_name_from_call(node)
-                        self._log_result(True, f"Function '{full_name}' is called",
-                                       custom_pass_feedback=custom_pass_feedback)
-                        return True
-                else:
-                    full_call_name = self._get_full_function_name_from_call(node)
-                    if full_call_name == func_name:
-                        self._log_result(True, f"Function '{func_name}' is called",
-                                       custom_pass_feedback=custom_pass_feedback)
-                        return True
-                    if isinstance(node.func, ast.Name) and node.func.id == func_name:
-                        self._log_result(True, f"Function '{func_name}' is called",
-                                       custom_pass_feedback=custom_pass_feedback)
-                        return True
+        if match_any_prefix:
+            if final_name in self._called_leaf_names:
+                full_name = self._called_leaf_names[final_name]
+                self._log_result(True, f"Function '{full_name}' is called",
+                               custom_pass_feedback=custom_pass_feedback)
+                return True
+        elif func_name in self._called_full_names:
+            self._log_result(True, f"Function '{func_name}' is called",
+                           custom_pass_feedback=custom_pass_feedback)
+            return True
         
         self._log_result(False, f"Function '{func_name}' is not called",
                        custom_fail_feedback=custom_fail_feedback)
@@ -793,25 +961,16 @@ class AutoGrader:
         func_parts = func_name.split('.')
         final_name = func_parts[-1]
         
-        for node in ast.walk(self._ast_tree):
-            if isinstance(node, ast.Call):
-                if match_any_prefix:
-                    call_name = self._get_function_name_from_call(node)
-                    if call_name == final_name:
-                        full_name = self._get_full_function_name_from_call(node)
-                        self._log_result(False, f"Function '{full_name}' should NOT be called",
-                                       custom_fail_feedback=custom_fail_feedback)
-                        return False
-                else:
-                    full_call_name = self._get_full_function_name_from_call(node)
-                    if full_call_name == func_name:
-                        self._log_result(False, f"Function '{func_name}' should NOT be called",
-                                       custom_fail_feedback=custom_fail_feedback)
-                        return False
-                    if isinstance(node.func, ast.Name) and node.func.id == func_name:
-                        self._log_result(False, f"Function '{func_name}' should NOT be called",
-                                       custom_fail_feedback=custom_fail_feedback)
-                        return False
+        if match_any_prefix:
+            if final_name in self._called_leaf_names:
+                full_name = self._called_leaf_names[final_name]
+                self._log_result(False, f"Function '{full_name}' should NOT be called",
+                               custom_fail_feedback=custom_fail_feedback)
+                return False
+        elif func_name in self._called_full_names:
+            self._log_result(False, f"Function '{func_name}' should NOT be called",
+                           custom_fail_feedback=custom_fail_feedback)
+            return False
         
         self._log_result(True, f"Function '{func_name}' is correctly not used",
                        custom_pass_feedback=custom_pass_feedback)
@@ -846,7 +1005,7 @@ class AutoGrader:
             
             try:
                 result = func(*args, **kwargs)
-                if isinstance(expected, (int, float)) and isinstance(result, (int, float)):
+                if _is_num(expected) and _is_num(result):
                     passed = abs(result - expected) <= tolerance
                 else:
                     passed = result == expected
@@ -902,19 +1061,7 @@ class AutoGrader:
             if solution_dir:
                 os.chdir(solution_dir)
             
-            with open(solution_path, 'r', encoding='utf-8') as f:
-                solution_content = f.read()
-            
-            # Close figures before running solution to avoid contamination
-            plt.close('all')
-            
-            safe_builtins = self._get_safe_builtins()
-            solution_namespace = {'__builtins__': safe_builtins}
-            
-            def execute_solution():
-                exec(solution_content, solution_namespace, solution_namespace)
-            
-            run_with_timeout(execute_solution, timeout=self.timeout)
+            solution_namespace, _ = self._get_solution_namespace(solution_path)
             
             if func_name not in solution_namespace:
                 self._restore_student_plot()
@@ -986,15 +1133,14 @@ class AutoGrader:
         var1_value = self.captured_vars[var1_name]
         var2_value = self.captured_vars[var2_name]
         
-        import numpy as np
         try:
             expected_var2 = relationship(var1_value)
             
             if isinstance(expected_var2, np.ndarray) or isinstance(var2_value, np.ndarray):
-                match = np.allclose(var2_value, expected_var2, atol=tolerance)
+                match = _fast_allclose(var2_value, expected_var2, atol=tolerance)
             elif isinstance(expected_var2, (list, tuple)) or isinstance(var2_value, (list, tuple)):
-                match = np.allclose(var2_value, expected_var2, atol=tolerance)
-            elif isinstance(expected_var2, (int, float)) and isinstance(var2_value, (int, float)):
+                match = _fast_allclose(var2_value, expected_var2, atol=tolerance)
+            elif _is_num(expected_var2) and _is_num(var2_value):
                 match = abs(var2_value - expected_var2) <= tolerance
             else:
                 match = var2_value == expected_var2
@@ -1015,6 +1161,13 @@ class AutoGrader:
     
     # ======================== PLOT CHECKING ========================
     
+    def _get_axes(self, fig_num: int):
+        """Return the current axes of figure fig_num, or None if that figure does not exist."""
+        # fignum_exists is a dict lookup; get_fignums() builds and sorts a list every call
+        if not plt.fignum_exists(fig_num):
+            return None
+        return plt.figure(fig_num).gca()
+    
     def check_plot_created(self, custom_pass_feedback: Optional[str] = None,
                            custom_fail_feedback: Optional[str] = None) -> bool:
         """Check if any plot was created."""
@@ -1029,12 +1182,11 @@ class AutoGrader:
                               custom_pass_feedback: Optional[str] = None,
                               custom_fail_feedback: Optional[str] = None) -> bool:
         """Check if plot has an x-axis label (any text)."""
-        if fig_num not in plt.get_fignums():
+        ax = self._get_axes(fig_num)
+        if ax is None:
             self._log_result(False, f"Figure {fig_num} not found", custom_fail_feedback=custom_fail_feedback)
             return False
         
-        fig = plt.figure(fig_num)
-        ax = fig.gca()
         xlabel = ax.get_xlabel()
         
         if xlabel and xlabel.strip():
@@ -1048,12 +1200,11 @@ class AutoGrader:
                               custom_pass_feedback: Optional[str] = None,
                               custom_fail_feedback: Optional[str] = None) -> bool:
         """Check if plot has a y-axis label (any text)."""
-        if fig_num not in plt.get_fignums():
+        ax = self._get_axes(fig_num)
+        if ax is None:
             self._log_result(False, f"Figure {fig_num} not found", custom_fail_feedback=custom_fail_feedback)
             return False
         
-        fig = plt.figure(fig_num)
-        ax = fig.gca()
         ylabel = ax.get_ylabel()
         
         if ylabel and ylabel.strip():
@@ -1067,12 +1218,11 @@ class AutoGrader:
                              custom_pass_feedback: Optional[str] = None,
                              custom_fail_feedback: Optional[str] = None) -> bool:
         """Check if plot has a title (any text)."""
-        if fig_num not in plt.get_fignums():
+        ax = self._get_axes(fig_num)
+        if ax is None:
             self._log_result(False, f"Figure {fig_num} not found", custom_fail_feedback=custom_fail_feedback)
             return False
         
-        fig = plt.figure(fig_num)
-        ax = fig.gca()
         title = ax.get_title()
         
         if title and title.strip():
@@ -1088,12 +1238,11 @@ class AutoGrader:
                               custom_pass_feedback: Optional[str] = None,
                               custom_fail_feedback: Optional[str] = None) -> bool:
         """Check specific plot properties."""
-        if fig_num not in plt.get_fignums():
+        ax = self._get_axes(fig_num)
+        if ax is None:
             self._log_result(False, f"Figure {fig_num} not found", custom_fail_feedback=custom_fail_feedback)
             return False
         
-        fig = plt.figure(fig_num)
-        ax = fig.gca()
         all_passed = True
         
         if title is not None:
@@ -1144,10 +1293,9 @@ class AutoGrader:
                 all_passed = False
         
         if has_grid is not None:
-            try:
-                grid_on = ax.xaxis._major_tick_kw.get('gridOn', False) or ax.yaxis._major_tick_kw.get('gridOn', False)
-            except:
-                grid_on = any(line.get_visible() for line in ax.xaxis.get_gridlines())
+            # any() stops at the first visible gridline, so a plot with a grid costs one probe
+            grid_on = (any(line.get_visible() for line in ax.xaxis.get_gridlines()) or
+                       any(line.get_visible() for line in ax.yaxis.get_gridlines()))
             
             if grid_on == has_grid:
                 self._log_result(True, f"Plot {'has' if has_grid else 'does not have'} grid",
@@ -1231,12 +1379,11 @@ class AutoGrader:
                               custom_pass_feedback: Optional[str] = None,
                               custom_fail_feedback: Optional[str] = None) -> bool:
         """Check if a line has the expected style (e.g., 'b-', 'r--', 'g:', 'b*', 'ro')."""
-        if fig_num not in plt.get_fignums():
+        ax = self._get_axes(fig_num)
+        if ax is None:
             self._log_result(False, f"Figure {fig_num} not found", custom_fail_feedback=custom_fail_feedback)
             return False
         
-        fig = plt.figure(fig_num)
-        ax = fig.gca()
         lines = ax.get_lines()
         
         if line_index >= len(lines):
@@ -1258,12 +1405,11 @@ class AutoGrader:
                                   custom_pass_feedback: Optional[str] = None,
                                   custom_fail_feedback: Optional[str] = None) -> bool:
         """Check if ANY line in the plot has the expected style."""
-        if fig_num not in plt.get_fignums():
+        ax = self._get_axes(fig_num)
+        if ax is None:
             self._log_result(False, f"Figure {fig_num} not found", custom_fail_feedback=custom_fail_feedback)
             return False
         
-        fig = plt.figure(fig_num)
-        ax = fig.gca()
         lines = ax.get_lines()
         
         if len(lines) == 0:
@@ -1286,12 +1432,11 @@ class AutoGrader:
                               custom_pass_feedback: Optional[str] = None,
                               custom_fail_feedback: Optional[str] = None) -> bool:
         """Check if a line has the expected line width."""
-        if fig_num not in plt.get_fignums():
+        ax = self._get_axes(fig_num)
+        if ax is None:
             self._log_result(False, f"Figure {fig_num} not found", custom_fail_feedback=custom_fail_feedback)
             return False
         
-        fig = plt.figure(fig_num)
-        ax = fig.gca()
         lines = ax.get_lines()
         
         if line_index >= len(lines):
@@ -1313,12 +1458,11 @@ class AutoGrader:
                                custom_pass_feedback: Optional[str] = None,
                                custom_fail_feedback: Optional[str] = None) -> bool:
         """Check if a line's markers have the expected size."""
-        if fig_num not in plt.get_fignums():
+        ax = self._get_axes(fig_num)
+        if ax is None:
             self._log_result(False, f"Figure {fig_num} not found", custom_fail_feedback=custom_fail_feedback)
             return False
         
-        fig = plt.figure(fig_num)
-        ax = fig.gca()
         lines = ax.get_lines()
         
         if line_index >= len(lines):
@@ -1344,12 +1488,11 @@ class AutoGrader:
                                    custom_pass_feedback: Optional[str] = None,
                                    custom_fail_feedback: Optional[str] = None) -> bool:
         """Compare plot line properties with a solution file."""
-        if fig_num not in plt.get_fignums():
+        ax = self._get_axes(fig_num)
+        if ax is None:
             self._log_result(False, f"Figure {fig_num} not found", custom_fail_feedback=custom_fail_feedback)
             return False
         
-        fig = plt.figure(fig_num)
-        ax = fig.gca()
         student_lines = ax.get_lines()
         
         if line_index >= len(student_lines):
@@ -1382,14 +1525,13 @@ class AutoGrader:
             # Now close all figures before running solution
             plt.close('all')
             
-            with open(solution_path, 'r', encoding='utf-8') as f:
-                solution_content = f.read()
+            solution_code = self._compile_solution(solution_path)
             
             safe_builtins = self._get_safe_builtins()
             solution_namespace = {'__builtins__': safe_builtins}
             
             def execute_solution():
-                exec(solution_content, solution_namespace, solution_namespace)
+                exec(solution_code, solution_namespace)
             
             run_with_timeout(execute_solution, timeout=self.timeout)
             
@@ -1483,7 +1625,7 @@ class AutoGrader:
             plt.close('all')
             safe_builtins = self._get_safe_builtins()
             temp_namespace = {'__builtins__': safe_builtins}
-            exec(self._content, temp_namespace, temp_namespace)
+            exec(self._code if self._code is not None else self._content, temp_namespace)
         except:
             pass  # Silently fail - plot restoration is best effort
         finally:
@@ -1495,12 +1637,12 @@ class AutoGrader:
                                 custom_pass_feedback: Optional[str] = None,
                                 custom_fail_feedback: Optional[str] = None) -> bool:
         """Check plot data length."""
-        if fig_num not in plt.get_fignums():
+        ax = self._get_axes(fig_num)
+        if ax is None:
             self._log_result(False, f"Figure {fig_num} not found", custom_fail_feedback=custom_fail_feedback)
             return False
         
-        fig = plt.figure(fig_num)
-        lines = fig.gca().get_lines()
+        lines = ax.get_lines()
         
         if line_index >= len(lines):
             self._log_result(False, f"Line {line_index} not found", custom_fail_feedback=custom_fail_feedback)
@@ -1542,11 +1684,12 @@ class AutoGrader:
                              custom_pass_feedback: Optional[str] = None,
                              custom_fail_feedback: Optional[str] = None) -> bool:
         """Check if plot has at least min_lines lines."""
-        if fig_num not in plt.get_fignums():
+        ax = self._get_axes(fig_num)
+        if ax is None:
             self._log_result(False, f"Figure {fig_num} not found", custom_fail_feedback=custom_fail_feedback)
             return False
         
-        lines = plt.figure(fig_num).gca().get_lines()
+        lines = ax.get_lines()
         
         if len(lines) >= min_lines:
             self._log_result(True, f"Plot has {len(lines)} lines (minimum: {min_lines})",
@@ -1560,11 +1703,12 @@ class AutoGrader:
                           custom_pass_feedback: Optional[str] = None,
                           custom_fail_feedback: Optional[str] = None) -> bool:
         """Check if plot has exactly exact_lines lines/data sets."""
-        if fig_num not in plt.get_fignums():
+        ax = self._get_axes(fig_num)
+        if ax is None:
             self._log_result(False, f"Figure {fig_num} not found", custom_fail_feedback=custom_fail_feedback)
             return False
         
-        lines = plt.figure(fig_num).gca().get_lines()
+        lines = ax.get_lines()
         
         if len(lines) == exact_lines:
             self._log_result(True, f"Plot has exactly {exact_lines} lines",
@@ -1579,12 +1723,12 @@ class AutoGrader:
                                 custom_pass_feedback: Optional[str] = None,
                                 custom_fail_feedback: Optional[str] = None) -> bool:
         """Check if any line in the plot matches a function."""
-        if fig_num not in plt.get_fignums():
+        ax = self._get_axes(fig_num)
+        if ax is None:
             self._log_result(False, f"Figure {fig_num} not found", custom_fail_feedback=custom_fail_feedback)
             return False
         
-        import numpy as np
-        lines = plt.figure(fig_num).gca().get_lines()
+        lines = ax.get_lines()
         
         for i, line in enumerate(lines):
             x, y = line.get_xdata(), line.get_ydata()
@@ -1592,7 +1736,7 @@ class AutoGrader:
                 continue
             try:
                 expected_y = function(np.array(x))
-                if np.allclose(y, expected_y, atol=tolerance):
+                if _fast_allclose(y, expected_y, atol=tolerance):
                     self._log_result(True, f"Line {i} matches expected function",
                                    custom_pass_feedback=custom_pass_feedback)
                     return True
@@ -1607,11 +1751,12 @@ class AutoGrader:
                          custom_pass_feedback: Optional[str] = None,
                          custom_fail_feedback: Optional[str] = None) -> bool:
         """Check plot color."""
-        if fig_num not in plt.get_fignums():
+        ax = self._get_axes(fig_num)
+        if ax is None:
             self._log_result(False, f"Figure {fig_num} not found", custom_fail_feedback=custom_fail_feedback)
             return False
         
-        lines = plt.figure(fig_num).gca().get_lines()
+        lines = ax.get_lines()
         if line_index >= len(lines):
             self._log_result(False, f"Line {line_index} not found", custom_fail_feedback=custom_fail_feedback)
             return False
@@ -1627,15 +1772,16 @@ class AutoGrader:
                 return True
             self._log_result(False, f"Line color mismatch", custom_fail_feedback=custom_fail_feedback)
             return False
-        except:
-            self._log_result(False, "Could not compare colors", custom_fail_feedback=custom_fail_feedback)
+        except (ValueError, TypeError) as e:
+            self._log_result(False, f"Could not compare colors: {e}", custom_fail_feedback=custom_fail_feedback)
             return False
     
     def get_plot_data(self, line_index: int = 0, fig_num: int = 1) -> Optional[Dict[str, Any]]:
         """Get plot data."""
-        if fig_num not in plt.get_fignums():
+        ax = self._get_axes(fig_num)
+        if ax is None:
             return None
-        lines = plt.figure(fig_num).gca().get_lines()
+        lines = ax.get_lines()
         if line_index >= len(lines):
             return None
         line = lines[line_index]
@@ -1656,14 +1802,24 @@ class AutoGrader:
             self._log_result(False, "No code content available", custom_fail_feedback=custom_fail_feedback)
             return False
         
-        search_content = self._content
-        search_phrase = phrase
-        
-        if not case_sensitive:
-            search_content = search_content.lower()
-            search_phrase = search_phrase.lower()
+        keyword_nodes = _KEYWORD_NODES.get(phrase.strip()) if case_sensitive else None
+        if keyword_nodes is not None and self._ast_tree is not None:
+            # Keywords are answered from the AST so 'for' in a comment or 'format' does not count
+            found = any(kind in self._node_kinds for kind in keyword_nodes)
+        else:
+            search_content = self._content
+            search_phrase = phrase
+            
+            if not case_sensitive:
+                # Lowercase the source once and reuse it for every case-insensitive check
+                if self._content_lower is None:
+                    self._content_lower = self._content.lower()
+                search_content = self._content_lower
+                search_phrase = search_phrase.lower()
+            
+            found = search_phrase in search_content
         
-        if search_phrase in search_content:
+        if found:
             self._log_result(True, f"Code contains '{phrase}'", custom_pass_feedback=custom_pass_feedback)
             return True
         self._log_result(False, f"Code does not contain '{phrase}'", custom_fail_feedback=custom_fail_feedback)
@@ -1677,45 +1833,17 @@ class AutoGrader:
             self._log_result(False, "AST not available", custom_fail_feedback=custom_fail_feedback)
             return False
         
-        operator_map = {
-            '+=': ast.Add, '-=': ast.Sub, '*=': ast.Mult, '/=': ast.Div,
-            '//=': ast.FloorDiv, '%=': ast.Mod, '**=': ast.Pow,
-            '+': ast.Add, '-': ast.Sub, '*': ast.Mult, '/': ast.Div,
-            '//': ast.FloorDiv, '%': ast.Mod, '**': ast.Pow,
-            '==': ast.Eq, '!=': ast.NotEq, '<': ast.Lt, '<=': ast.LtE,
-            '>': ast.Gt, '>=': ast.GtE, 'and': ast.And, 'or': ast.Or, 'not': ast.Not,
-        }
-        
-        if operator not in operator_map:
+        if operator not in _OPERATOR_MAP:
             return self.check_code_contains(operator, custom_pass_feedback=custom_pass_feedback,
                                            custom_fail_feedback=custom_fail_feedback)
         
-        target_op = operator_map[operator]
+        # Augmented assignments only count as AugAssign; plain operators only in expressions
+        used_ops = self._aug_ops if operator in _AUG_OPERATORS else self._expr_ops
         
-        for node in ast.walk(self._ast_tree):
-            if operator in ['+=', '-=', '*=', '/=', '//=', '%=', '**=']:
-                if isinstance(node, ast.AugAssign) and isinstance(node.op, target_op):
-                    self._log_result(True, f"Operator '{operator}' is used",
-                                   custom_pass_feedback=custom_pass_feedback)
-                    return True
-            elif isinstance(node, ast.BinOp) and isinstance(node.op, target_op):
-                self._log_result(True, f"Operator '{operator}' is used",
-                               custom_pass_feedback=custom_pass_feedback)
-                return True
-            elif isinstance(node, ast.Compare):
-                for op in node.ops:
-                    if isinstance(op, target_op):
-                        self._log_result(True, f"Operator '{operator}' is used",
-                                       custom_pass_feedback=custom_pass_feedback)
-                        return True
-            elif isinstance(node, ast.BoolOp) and isinstance(node.op, target_op):
-                self._log_result(True, f"Operator '{operator}' is used",
-                               custom_pass_feedback=custom_pass_feedback)
-                return True
-            elif isinstance(node, ast.UnaryOp) and isinstance(node.op, target_op):
-                self._log_result(True, f"Operator '{operator}' is used",
-                               custom_pass_feedback=custom_pass_feedback)
-                return True
+        if _OPERATOR_MAP[operator] in used_ops:
+            self._log_result(True, f"Operator '{operator}' is used",
+                           custom_pass_feedback=custom_pass_feedback)
+            return True
         
         self._log_result(False, f"Operator '{operator}' is not used",
                        custom_fail_feedback=custom_fail_feedback)
@@ -1730,10 +1858,9 @@ class AutoGrader:
             self._log_result(False, "AST not available", custom_fail_feedback=custom_fail_feedback)
             return False
         
-        for node in ast.walk(self._ast_tree):
-            if isinstance(node, ast.For):
-                self._log_result(True, "For loop is used", custom_pass_feedback=custom_pass_feedback)
-                return True
+        if ast.For in self._node_kinds:
+            self._log_result(True, "For loop is used", custom_pass_feedback=custom_pass_feedback)
+            return True
         
         self._log_result(False, "For loop is not used", custom_fail_feedback=custom_fail_feedback)
         return False
@@ -1745,10 +1872,9 @@ class AutoGrader:
             self._log_result(False, "AST not available", custom_fail_feedback=custom_fail_feedback)
             return False
         
-        for node in ast.walk(self._ast_tree):
-            if isinstance(node, ast.While):
-                self._log_result(True, "While loop is used", custom_pass_feedback=custom_pass_feedback)
-                return True
+        if ast.While in self._node_kinds:
+            self._log_result(True, "While loop is used", custom_pass_feedback=custom_pass_feedback)
+            return True
         
         self._log_result(False, "While loop is not used", custom_fail_feedback=custom_fail_feedback)
         return False
@@ -1760,10 +1886,9 @@ class AutoGrader:
             self._log_result(False, "AST not available", custom_fail_feedback=custom_fail_feedback)
             return False
         
-        for node in ast.walk(self._ast_tree):
-            if isinstance(node, ast.If):
-                self._log_result(True, "If statement is used", custom_pass_feedback=custom_pass_feedback)
-                return True
+        if ast.If in self._node_kinds:
+            self._log_result(True, "If statement is used", custom_pass_feedback=custom_pass_feedback)
+            return True
         
         self._log_result(False, "If statement is not used", custom_fail_feedback=custom_fail_feedback)
         return False
@@ -1778,13 +1903,12 @@ class AutoGrader:
                            custom_fail_feedback=custom_fail_feedback)
             return None
         
-        if loop_variable not in self.captured_vars:
+        actual_count = self.captured_vars.get(loop_variable, _MISSING)
+        if actual_count is _MISSING:
             self._log_result(False, f"Loop counter '{loop_variable}' not found",
                            custom_fail_feedback=custom_fail_feedback)
             return None
         
-        actual_count = self.captured_vars[loop_variable]
-        
         if not isinstance(actual_count, (int, float)):
             self._log_result(False, f"Variable '{loop_variable}' is not a number",
                            custom_fail_feedback=custom_fail_feedback)
@@ -1810,7 +1934,7 @@ class AutoGrader:
     def get_summary(self) -> Dict[str, Any]:
         """Get summary of test results."""
         total = len(self.test_results)
-        passed = sum(1 for r in self.test_results if r['passed'])
+        passed = self._passed_count
         failed = total - passed
         
         return {
@@ -0,0 +1,61 @@
+"""
+Checks for individual AutoGrader methods, run against small student scripts.
+"""
+
+import os
+import sys
+
+import pytest
+
+pytest.importorskip('numpy')
+pytest.importorskip('matplotlib')
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from autograder import AutoGrader
+
+
+def run_student(tmp_path, code):
+    path = tmp_path / 'student.py'
+    path.write_text(code, encoding='utf-8')
+    grader = AutoGrader(str(path))
+    grader.execute_script()
+    return grader
+
+
+@pytest.mark.parametrize('array_code, expected, message', [
+    ("np.array([True, False, True])", [True, True, True],
+     "at index (1,) got False, expected True (diff 1.00e+00)"),
+    ("np.array([1, 5], dtype=np.uint8)", [3, 5],
+     "at index (0,) got 1, expected 3 (diff 2.00e+00)"),
+])
+def test_check_array_equals_reports_mismatch(tmp_path, capsys, array_code, expected, message):
+    grader = run_student(tmp_path, f"import numpy as np\na = {array_code}\n")
+
+    assert grader.check_array_equals('a', expected) is False
+    assert f"✗ FAIL: 'a' array does not equal expected: {message}" in capsys.readouterr().out
+
+
+def test_code_that_parses_but_does_not_compile_fails_once(tmp_path, capsys):
+    grader = run_student(tmp_path, "x = 1\nreturn x\n")
+
+    output = capsys.readouterr().out
+    assert grader.check_variable_value('x', 1) is False
+    assert "Syntax error in code" not in output
+    assert output.count("✗ FAIL") == 1
+    assert "'return' outside function" in output
+
+
+def test_check_function_any_line_leaves_plot_data_alone(tmp_path, capsys):
+    grader = run_student(tmp_path, "import numpy as np\nimport matplotlib.pyplot as plt\n"
+                                   "x = np.linspace(0, 1, 5)\nplt.plot(x, x**2)\n")
+
+    def squared_in_place(x):
+        x **= 2
+        return x
+
+    line = grader._get_axes(1).get_lines()[0]
+    before = line.get_xdata().copy()
+    assert grader.check_function_any_line(squared_in_place) is True
+    assert (line.get_xdata() == before).all()
@@ -0,0 +1,170 @@
+"""
+End-to-end checks for the student GUI's compiled test plans.
+
+The example workbook and submissions from setup-examples.py are graded
+through AutoGraderGUI.get_compiled_tests/run_tests, the same path that
+Check Code uses, without opening a Tk window.
+"""
+
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+
+import pytest
+
+pytest.importorskip('tkinter')
+pytest.importorskip('numpy')
+pd = pytest.importorskip('pandas')
+pytest.importorskip('matplotlib')
+pytest.importorskip('openpyxl')
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+
+def load_script(name, filename):
+    """Import one of the repo's hyphenated scripts as a module."""
+    spec = importlib.util.spec_from_file_location(name, os.path.join(REPO_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+with contextlib.redirect_stdout(io.StringIO()):
+    setup_examples = load_script('setup_examples', 'setup-examples.py')
+    gui_app = load_script('autograder_gui_app', 'autograder-gui-app.py')
+
+
+class _NoTkRoot:
+    """Stands in for the Tk root and records the calls the worker schedules."""
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, func=None, *args):
+        self.scheduled.append((func, args))
+
+
+class _FakeWidget:
+    """Records the state/text that the GUI sets on a button, label variable or text box."""
+    def __init__(self):
+        self.state = 'normal'
+        self.value = ''
+
+    def config(self, state):
+        self.state = state
+
+    def set(self, value):
+        self.value = value
+
+    def insert(self, index, text, tag=None):
+        pass
+
+
+def make_gui():
+    gui = gui_app.AutoGraderGUI.__new__(gui_app.AutoGraderGUI)
+    gui.root = _NoTkRoot()
+    gui.assignments = {}
+    gui._compiled_tests = {}
+    gui._results_log = []
+    gui._saved_stdout = None
+    gui._script_bytes = None
+    gui._script_source = None
+    gui.config = None
+    gui.debug_mode = True
+    gui.grader = None
+    gui.check_button = _FakeWidget()
+    gui.clear_button = _FakeWidget()
+    gui.export_button = _FakeWidget()
+    gui.status_var = _FakeWidget()
+    gui.results_text = _FakeWidget()
+    gui._excel = pd.ExcelFile('assignments.xlsx')
+    return gui
+
+
+@pytest.fixture
+def examples_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        setup_examples.create_assignments_excel()
+        setup_examples.create_example_submissions()
+        setup_examples.create_solution_files()
+    return tmp_path
+
+
+def grade(submission, sheet_name):
+    """Grade a submission against one sheet; returns (grader output, GUI result lines)."""
+    gui = make_gui()
+    buf = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buf):
+            gui.grader = gui_app.AutoGrader(submission)
+            gui.grader.execute_script()
+            gui.run_tests(gui.get_compiled_tests(sheet_name))
+    finally:
+        gui._excel.close()
+    return buf.getvalue(), gui._results_log
+
+
+def test_example_assignment_passes(examples_dir):
+    output, gui_lines = grade('example_submissions/assignment1_submission.py',
+                              'Assignment 1 - Variables')
+
+    assert not any('Error in test' in line for line in gui_lines)
+    assert "✓ PASS: Great job setting x to 10!" in output
+    assert "✓ PASS: 'message' is of type str" in output
+    assert "FAIL" not in output
+
+
+def test_example_assignment_reports_failures(examples_dir):
+    with open('wrong_submission.py', 'w', encoding='utf-8') as f:
+        f.write("x = 11\ny = 20\nsum_xy = x + y\nmessage = 'hi'\n")
+
+    output, gui_lines = grade('wrong_submission.py', 'Assignment 1 - Variables')
+
+    assert not any('Error in test' in line for line in gui_lines)
+    assert "✗ FAIL: Make sure x is assigned the value 10" in output
+    assert "✗ FAIL: 'sum_xy' = 31, expected 30" in output
+    assert "✓ PASS: 'y' = 20" in output
+
+
+def test_check_worker_grades_and_restores_stdout(examples_dir):
+    gui = make_gui()
+    gui._set_action_buttons_state('disabled')
+    stdout = sys.stdout
+    try:
+        gui._do_check('Test Student', 'Assignment 1 - Variables',
+                      'example_submissions/assignment1_submission.py')
+    finally:
+        gui._excel.close()
+
+    assert sys.stdout is stdout
+    results = ''.join(gui._results_log)
+    assert "✓ PASS: Great job setting x to 10!" in results
+    assert "Passed: 6" in results
+    assert "Failed: 0" in results
+
+    for func, args in gui.root.scheduled:
+        func(*args)
+    assert gui.status_var.value == "Code checking complete!"
+    assert {gui.check_button.state, gui.clear_button.state, gui.export_button.state} == {'normal'}
+
+
+def test_check_worker_restores_stdout_after_error(examples_dir, monkeypatch):
+    gui = make_gui()
+
+    def broken_run_tests(compiled_tests):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(gui, 'run_tests', broken_run_tests)
+    stdout = sys.stdout
+    try:
+        gui._do_check('Test Student', 'Assignment 1 - Variables',
+                      'example_submissions/assignment1_submission.py')
+    finally:
+        gui._excel.close()
+
+    assert sys.stdout is stdout
+    assert "\n\nERROR: boom\n" in gui._results_log
+    assert (gui._set_action_buttons_state, ('normal',)) in gui.root.scheduled